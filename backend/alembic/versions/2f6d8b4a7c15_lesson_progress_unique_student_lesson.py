@@ -0,0 +1,61 @@
+"""lesson_progress_unique_student_lesson
+
+Revision ID: 2f6d8b4a7c15
+Revises: 9e3b51f0c6a4
+Create Date: 2026-10-18 13:41:05.112734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2f6d8b4a7c15'
+down_revision: Union[str, None] = '9e3b51f0c6a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('lesson_progress', sa.Column('completed_at', sa.DateTime(), nullable=True))
+
+    # Merge duplicate (student, lesson) rows into the oldest one before adding the constraint
+    op.execute("""
+        UPDATE lesson_progress AS keep
+        SET is_completed = dup.is_completed,
+            last_watched_position = dup.last_watched_position,
+            updated_at = dup.updated_at
+        FROM (
+            SELECT MIN(id) AS id,
+                   BOOL_OR(COALESCE(is_completed, false)) AS is_completed,
+                   MAX(last_watched_position) AS last_watched_position,
+                   MAX(updated_at) AS updated_at
+            FROM lesson_progress
+            GROUP BY student_id, lesson_id
+            HAVING COUNT(*) > 1
+        ) AS dup
+        WHERE keep.id = dup.id
+    """)
+    op.execute("""
+        DELETE FROM lesson_progress AS extra
+        USING lesson_progress AS keep
+        WHERE extra.student_id = keep.student_id
+          AND extra.lesson_id = keep.lesson_id
+          AND extra.id > keep.id
+    """)
+
+    # Best known completion time for rows completed before this column existed
+    op.execute("""
+        UPDATE lesson_progress
+        SET completed_at = COALESCE(updated_at, now() AT TIME ZONE 'utc')
+        WHERE is_completed
+    """)
+
+    op.create_unique_constraint('uq_lesson_progress_student_lesson', 'lesson_progress', ['student_id', 'lesson_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_lesson_progress_student_lesson', 'lesson_progress', type_='unique')
+    op.drop_column('lesson_progress', 'completed_at')
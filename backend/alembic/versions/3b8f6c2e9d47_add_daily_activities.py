@@ -0,0 +1,86 @@
+"""add_daily_activities
+
+Revision ID: 3b8f6c2e9d47
+Revises: e1b47d2c8a90
+Create Date: 2026-10-18 17:30:42.781306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8f6c2e9d47'
+down_revision: Union[str, None] = 'e1b47d2c8a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Local day of a naive UTC timestamp column (settings.TIMEZONE at the time of writing)
+LOCAL_DAY = "(({col} AT TIME ZONE 'UTC') AT TIME ZONE 'Asia/Ho_Chi_Minh')::date"
+
+
+def upgrade() -> None:
+    op.create_table('daily_activities',
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('study_seconds', sa.Integer(), nullable=False),
+    sa.Column('estimated_seconds', sa.Integer(), nullable=False),
+    sa.Column('lessons_completed', sa.Integer(), nullable=False),
+    sa.Column('quizzes_taken', sa.Integer(), nullable=False),
+    sa.Column('completed_lesson_ids', postgresql.ARRAY(sa.Integer()), nullable=False),
+    sa.Column('low_score_lesson_ids', postgresql.ARRAY(sa.Integer()), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['student_id'], ['student_profiles.id'], ),
+    sa.PrimaryKeyConstraint('student_id', 'day')
+    )
+
+    # Backfill: completions, quizzes, then logged study time
+    op.execute(f"""
+        INSERT INTO daily_activities
+            (student_id, day, study_seconds, estimated_seconds, lessons_completed, quizzes_taken,
+             completed_lesson_ids, low_score_lesson_ids, updated_at)
+        SELECT lp.student_id, {LOCAL_DAY.format(col='lp.completed_at')}, 0,
+               SUM(COALESCE(NULLIF(vm.duration_seconds, 0), 300)), COUNT(*), 0,
+               ARRAY_AGG(lp.lesson_id ORDER BY lp.lesson_id), '{{}}', now() AT TIME ZONE 'utc'
+        FROM lesson_progress lp
+        LEFT JOIN video_materials vm ON vm.lesson_id = lp.lesson_id
+        WHERE lp.completed_at IS NOT NULL
+        GROUP BY 1, 2
+    """)
+    op.execute(f"""
+        INSERT INTO daily_activities
+            (student_id, day, study_seconds, estimated_seconds, lessons_completed, quizzes_taken,
+             completed_lesson_ids, low_score_lesson_ids, updated_at)
+        SELECT student_id, {LOCAL_DAY.format(col='created_at')}, 0, 0, 0, COUNT(*), '{{}}',
+               COALESCE(ARRAY_AGG(DISTINCT lesson_id) FILTER (WHERE NOT passed), '{{}}'),
+               now() AT TIME ZONE 'utc'
+        FROM quiz_results
+        WHERE created_at IS NOT NULL
+        GROUP BY 1, 2
+        ON CONFLICT (student_id, day) DO UPDATE
+        SET quizzes_taken = excluded.quizzes_taken,
+            low_score_lesson_ids = excluded.low_score_lesson_ids
+    """)
+    op.execute(f"""
+        INSERT INTO daily_activities
+            (student_id, day, study_seconds, estimated_seconds, lessons_completed, quizzes_taken,
+             completed_lesson_ids, low_score_lesson_ids, updated_at)
+        SELECT student_id, {LOCAL_DAY.format(col='occurred_at')}, SUM(LEAST(gap, 60))::int, 0, 0, 0,
+               '{{}}', '{{}}', now() AT TIME ZONE 'utc'
+        FROM (
+            SELECT student_id, occurred_at,
+                   EXTRACT(EPOCH FROM occurred_at - LAG(occurred_at) OVER (PARTITION BY session_id ORDER BY occurred_at)) AS gap
+            FROM learning_events
+        ) AS gaps
+        WHERE gap IS NOT NULL
+        GROUP BY 1, 2
+        ON CONFLICT (student_id, day) DO UPDATE
+        SET study_seconds = excluded.study_seconds
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('daily_activities')
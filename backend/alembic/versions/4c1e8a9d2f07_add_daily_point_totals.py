@@ -0,0 +1,45 @@
+"""add_daily_point_totals
+
+Revision ID: 4c1e8a9d2f07
+Revises: b78d9964cef2
+Create Date: 2026-10-18 09:12:44.318202
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c1e8a9d2f07'
+down_revision: Union[str, None] = 'b78d9964cef2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('daily_point_totals',
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('currency_type', postgresql.ENUM('STAR', 'GEM', name='currencytype', create_type=False), nullable=False),
+    sa.Column('amount', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['student_id'], ['student_profiles.id'], ),
+    sa.PrimaryKeyConstraint('student_id', 'day', 'currency_type')
+    )
+    op.create_index('ix_daily_point_totals_currency_day', 'daily_point_totals', ['currency_type', 'day'], unique=False)
+
+    # Backfill from the existing point log (earnings only, like the leaderboard)
+    op.execute("""
+        INSERT INTO daily_point_totals (student_id, day, currency_type, amount)
+        SELECT student_id, created_at::date, currency_type, SUM(change_amount)
+        FROM point_logs
+        WHERE change_amount > 0 AND currency_type IS NOT NULL AND created_at IS NOT NULL
+        GROUP BY student_id, created_at::date, currency_type
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_daily_point_totals_currency_day', table_name='daily_point_totals')
+    op.drop_table('daily_point_totals')
@@ -0,0 +1,52 @@
+"""add_lesson_quiz_summaries
+
+Revision ID: 7a3c9e1d5b28
+Revises: 2f6d8b4a7c15
+Create Date: 2026-10-18 14:26:51.904117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a3c9e1d5b28'
+down_revision: Union[str, None] = '2f6d8b4a7c15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('lesson_quiz_summaries',
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('lesson_id', sa.Integer(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('best_score', sa.Integer(), nullable=False),
+    sa.Column('last_score', sa.Integer(), nullable=False),
+    sa.Column('first_passed_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['lesson_id'], ['lessons.id'], ),
+    sa.ForeignKeyConstraint(['student_id'], ['student_profiles.id'], ),
+    sa.PrimaryKeyConstraint('student_id', 'lesson_id')
+    )
+
+    # Backfill from the existing quiz history
+    op.execute("""
+        INSERT INTO lesson_quiz_summaries
+            (student_id, lesson_id, attempts, best_score, last_score, first_passed_at, updated_at)
+        SELECT student_id,
+               lesson_id,
+               COUNT(*),
+               MAX(score),
+               (ARRAY_AGG(score ORDER BY created_at DESC NULLS LAST, id DESC))[1],
+               MIN(COALESCE(created_at, now() AT TIME ZONE 'utc')) FILTER (WHERE passed),
+               MAX(created_at)
+        FROM quiz_results
+        GROUP BY student_id, lesson_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('lesson_quiz_summaries')
@@ -0,0 +1,32 @@
+"""add_content_versions
+
+Revision ID: 8b2e4d6f1a93
+Revises: 5d9a1f3b7e62
+Create Date: 2026-10-18 19:20:05.413862
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e4d6f1a93'
+down_revision: Union[str, None] = '5d9a1f3b7e62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('content_versions',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.execute("INSERT INTO content_versions (name, version, updated_at) VALUES ('curriculum', 1, now())")
+
+
+def downgrade() -> None:
+    op.drop_table('content_versions')
@@ -0,0 +1,30 @@
+"""add_leaderboard_scope_indexes
+
+Revision ID: 9e3b51f0c6a4
+Revises: 4c1e8a9d2f07
+Create Date: 2026-10-18 10:02:17.640981
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e3b51f0c6a4'
+down_revision: Union[str, None] = '4c1e8a9d2f07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_student_profiles_parent_id'), 'student_profiles', ['parent_id'], unique=False)
+    op.create_index(op.f('ix_courses_level'), 'courses', ['level'], unique=False)
+    op.create_index('ix_user_courses_course_active_user', 'user_courses', ['course_id', 'is_active', 'user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_courses_course_active_user', table_name='user_courses')
+    op.drop_index(op.f('ix_courses_level'), table_name='courses')
+    op.drop_index(op.f('ix_student_profiles_parent_id'), table_name='student_profiles')
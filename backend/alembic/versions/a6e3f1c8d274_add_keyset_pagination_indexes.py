@@ -0,0 +1,32 @@
+"""add_keyset_pagination_indexes
+
+Revision ID: a6e3f1c8d274
+Revises: f2c9a5b3d816
+Create Date: 2026-10-18 21:15:48.903126
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6e3f1c8d274'
+down_revision: Union[str, None] = 'f2c9a5b3d816'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_orders_user_created', 'orders', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_chat_history_user_created', 'chat_history', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_user_word_progress_user_next_review', 'user_word_progress', ['user_id', 'next_review_at', 'id'], unique=False)
+    op.create_index('ix_point_logs_student_created', 'point_logs', ['student_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_point_logs_student_created', table_name='point_logs')
+    op.drop_index('ix_user_word_progress_user_next_review', table_name='user_word_progress')
+    op.drop_index('ix_chat_history_user_created', table_name='chat_history')
+    op.drop_index('ix_orders_user_created', table_name='orders')
@@ -0,0 +1,40 @@
+"""user_word_progress_unique_user_word
+
+Revision ID: c5e2a7f94d31
+Revises: 7a3c9e1d5b28
+Create Date: 2026-10-18 15:08:37.265410
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e2a7f94d31'
+down_revision: Union[str, None] = '7a3c9e1d5b28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep the most advanced row per (user, word) before adding the constraint
+    op.execute("""
+        DELETE FROM user_word_progress
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY user_id, word_id
+                    ORDER BY box_level DESC NULLS LAST, last_reviewed_at DESC NULLS LAST, id
+                ) AS rn
+                FROM user_word_progress
+            ) AS ranked
+            WHERE rn > 1
+        )
+    """)
+    op.create_unique_constraint('uq_user_word_progress_user_word', 'user_word_progress', ['user_id', 'word_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_user_word_progress_user_word', 'user_word_progress', type_='unique')
@@ -0,0 +1,36 @@
+"""add_unit_bundles
+
+Revision ID: c7d3b9e1f485
+Revises: a6e3f1c8d274
+Create Date: 2026-10-18 22:47:31.508214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d3b9e1f485'
+down_revision: Union[str, None] = 'a6e3f1c8d274'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('unit_bundles',
+    sa.Column('unit_id', sa.Integer(), nullable=False),
+    sa.Column('content_version', sa.BigInteger(), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['unit_id'], ['units.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('unit_id')
+    )
+    op.create_index(op.f('ix_unit_bundles_content_hash'), 'unit_bundles', ['content_hash'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_unit_bundles_content_hash'), table_name='unit_bundles')
+    op.drop_table('unit_bundles')
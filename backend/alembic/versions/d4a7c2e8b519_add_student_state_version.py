@@ -0,0 +1,26 @@
+"""add_student_state_version
+
+Revision ID: d4a7c2e8b519
+Revises: 8b2e4d6f1a93
+Create Date: 2026-10-18 20:02:37.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a7c2e8b519'
+down_revision: Union[str, None] = '8b2e4d6f1a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('student_profiles', sa.Column('state_version', sa.BigInteger(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('student_profiles', 'state_version')
@@ -0,0 +1,52 @@
+"""add_learning_events
+
+Revision ID: e1b47d2c8a90
+Revises: c5e2a7f94d31
+Create Date: 2026-10-18 16:12:09.553120
+
+"""
+from datetime import datetime, timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1b47d2c8a90'
+down_revision: Union[str, None] = 'c5e2a7f94d31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(sa.schema.CreateSequence(sa.Sequence('learning_events_id_seq')))
+    op.create_table('learning_events',
+    sa.Column('id', sa.BigInteger(), server_default=sa.text("nextval('learning_events_id_seq')"), nullable=False),
+    sa.Column('occurred_at', sa.DateTime(), nullable=False),
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('lesson_id', sa.Integer(), nullable=True),
+    sa.Column('session_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('event_type', sa.Enum('SESSION_START', 'HEARTBEAT', 'SESSION_END', name='learningeventtype'), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=True),
+    sa.PrimaryKeyConstraint('id', 'occurred_at'),
+    postgresql_partition_by='RANGE (occurred_at)'
+    )
+    op.create_index('ix_learning_events_student_occurred', 'learning_events', ['student_id', 'occurred_at'], unique=False)
+
+    # First daily partitions; the beat job keeps creating them ahead of time
+    today = datetime.utcnow().date()
+    for offset in range(-1, 8):
+        day = today + timedelta(days=offset)
+        op.execute(
+            f"CREATE TABLE IF NOT EXISTS learning_events_{day:%Y%m%d} PARTITION OF learning_events "
+            f"FOR VALUES FROM ('{day.isoformat()}') TO ('{(day + timedelta(days=1)).isoformat()}')"
+        )
+
+
+def downgrade() -> None:
+    # Dropping the parent drops every partition
+    op.drop_table('learning_events')
+    op.execute(sa.schema.DropSequence(sa.Sequence('learning_events_id_seq')))
+    sa.Enum(name='learningeventtype').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,48 @@
+"""add_content_sync_versions
+
+Revision ID: e8a4f2d6b093
+Revises: c7d3b9e1f485
+Create Date: 2026-10-18 23:36:12.640587
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8a4f2d6b093'
+down_revision: Union[str, None] = 'c7d3b9e1f485'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SYNCED_TABLES = ['courses', 'units', 'lessons', 'questions', 'vocabularies']
+
+
+def upgrade() -> None:
+    for table in SYNCED_TABLES:
+        # Existing rows get this migration's transaction id
+        op.add_column(table, sa.Column('row_version', sa.BigInteger(), server_default=sa.text('pg_current_xact_id()::text::bigint'), nullable=False))
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(), nullable=True))
+        op.create_index(op.f(f'ix_{table}_row_version'), table, ['row_version'], unique=False)
+    op.create_table('content_tombstones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('entity', sa.String(), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('row_version', sa.BigInteger(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_content_tombstones_id'), 'content_tombstones', ['id'], unique=False)
+    op.create_index(op.f('ix_content_tombstones_row_version'), 'content_tombstones', ['row_version'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_content_tombstones_row_version'), table_name='content_tombstones')
+    op.drop_index(op.f('ix_content_tombstones_id'), table_name='content_tombstones')
+    op.drop_table('content_tombstones')
+    for table in reversed(SYNCED_TABLES):
+        op.drop_index(op.f(f'ix_{table}_row_version'), table_name=table)
+        op.drop_column(table, 'updated_at')
+        op.drop_column(table, 'row_version')
@@ -0,0 +1,47 @@
+"""add_student_completion_bitmap
+
+Revision ID: f2c9a5b3d816
+Revises: d4a7c2e8b519
+Create Date: 2026-10-18 20:41:09.227361
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c9a5b3d816'
+down_revision: Union[str, None] = 'd4a7c2e8b519'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('student_profiles', sa.Column('completion_bitmap', sa.LargeBinary(), server_default='', nullable=False))
+    # Backfill: bit n of byte n / 8 for every completed lesson id n (set_bit layout)
+    op.execute("""
+        WITH bits AS (
+            SELECT student_id, lesson_id / 8 AS byte_no, bit_or(1 << (lesson_id % 8)) AS byte
+            FROM lesson_progress
+            WHERE is_completed
+            GROUP BY student_id, lesson_id / 8
+        ), spans AS (
+            SELECT student_id, max(byte_no) AS last_byte FROM bits GROUP BY student_id
+        ), bitmaps AS (
+            SELECT spans.student_id,
+                   decode(string_agg(lpad(to_hex(coalesce(bits.byte, 0)), 2, '0'), '' ORDER BY g.byte_no), 'hex') AS bitmap
+            FROM spans
+            CROSS JOIN LATERAL generate_series(0, spans.last_byte) AS g(byte_no)
+            LEFT JOIN bits ON bits.student_id = spans.student_id AND bits.byte_no = g.byte_no
+            GROUP BY spans.student_id
+        )
+        UPDATE student_profiles SET completion_bitmap = bitmaps.bitmap
+        FROM bitmaps
+        WHERE student_profiles.id = bitmaps.student_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('student_profiles', 'completion_bitmap')
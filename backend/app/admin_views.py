@@ -8,6 +8,10 @@ from typing import Any
 from app.models.order import Order
 from app.models.coupon import Coupon
 from app.core import security
+from app.core.database import SessionLocal
+from app.services.curriculum_service import notify_curriculum_changed
+from app.services.leaderboard_service import leaderboard_registry
+from app.services.student_state_service import bump_user_state_version
 from wtforms import PasswordField, SelectField
 
 from app.models.enums import UserRole, CourseLevel, LessonType, DiscountType
@@ -65,7 +69,28 @@ class UserAdmin(ModelView, model=User):
              except ValueError:
                  pass
 
-class CourseAdmin(ModelView, model=Course):
+    async def after_model_change(self, data: dict, model: Any, is_created: bool, request: Any = None) -> None:
+        # Name/email shown on the profile may have changed
+        db = SessionLocal()
+        try:
+            bump_user_state_version(db, model.id)
+            db.commit()
+        finally:
+            db.close()
+
+class CurriculumChangeMixin:
+    """
+    Bump the curriculum version after every save/delete so each worker
+    reloads its cached curriculum snapshot.
+    """
+
+    async def after_model_change(self, data: dict, model: Any, is_created: bool, request: Any = None) -> None:
+        notify_curriculum_changed()
+
+    async def after_model_delete(self, model: Any, request: Any = None) -> None:
+        notify_curriculum_changed()
+
+class CourseAdmin(CurriculumChangeMixin, ModelView, model=Course):
     column_list = [Course.id, Course.title, Course.level]
     can_create = True
     can_edit = True
@@ -88,7 +113,18 @@ class CourseAdmin(ModelView, model=Course):
              except ValueError:
                  pass
 
-class UnitAdmin(ModelView, model=Unit):
+    async def after_model_change(self, data: dict, model: Any, is_created: bool, request: Any = None) -> None:
+        await super().after_model_change(data, model, is_created, request)
+        # A new level or a deleted course changes who belongs to level/course leaderboards
+        leaderboard_registry.invalidate("course")
+        leaderboard_registry.invalidate("level")
+
+    async def after_model_delete(self, model: Any, request: Any = None) -> None:
+        await super().after_model_delete(model, request)
+        leaderboard_registry.invalidate("course")
+        leaderboard_registry.invalidate("level")
+
+class UnitAdmin(CurriculumChangeMixin, ModelView, model=Unit):
     column_list = [Unit.id, Unit.title, Unit.course_id, Unit.order_index]
     can_create = True
     can_edit = True
@@ -101,7 +137,7 @@ class UnitAdmin(ModelView, model=Unit):
 
 from wtforms import FileField
 
-class LessonAdmin(ModelView, model=Lesson):
+class LessonAdmin(CurriculumChangeMixin, ModelView, model=Lesson):
     column_list = [Lesson.id, Lesson.title, Lesson.unit, Lesson.lesson_type, Lesson.pronunciation_word]
     
     # Explicitly list all fields
@@ -172,7 +208,7 @@ class LessonAdmin(ModelView, model=Lesson):
              except ValueError:
                  pass
 
-class QuestionAdmin(ModelView, model=Question):
+class QuestionAdmin(CurriculumChangeMixin, ModelView, model=Question):
     column_list = [Question.id, Question.text, Question.lesson_id]
     can_create = True
     can_edit = True
@@ -0,0 +1,82 @@
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Query
+from itsdangerous import BadSignature, URLSafeSerializer
+from sqlalchemy import tuple_
+
+from app.core.config import settings
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Signed so clients can't forge positions; `scope` stops a cursor of one list
+# being replayed against another
+_serializer = URLSafeSerializer(settings.SECRET_KEY, salt="keyset-cursor")
+
+
+def page_params(
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+) -> Tuple[Optional[str], int]:
+    return cursor, limit
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _load(value: Any) -> Any:
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(scope: str, values: Sequence[Any]) -> str:
+    return _serializer.dumps([scope, [_dump(value) for value in values]])
+
+
+def decode_cursor(scope: str, cursor: str) -> List[Any]:
+    try:
+        cursor_scope, values = _serializer.loads(cursor)
+        if cursor_scope != scope:
+            raise ValueError(cursor_scope)
+        return [_load(value) for value in values]
+    except (BadSignature, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_paginate(
+    query,
+    columns: Sequence,
+    scope: str,
+    cursor: Optional[str],
+    limit: int,
+    descending: bool = False,
+    key: Optional[Callable[[Any], Sequence[Any]]] = None,
+) -> Tuple[list, Optional[str]]:
+    """
+    One page of `query` ordered by `columns` (a sort key, then a unique id).
+
+    The cursor holds the sort values of the last row returned, so the next
+    page is a `(sort_key, id) > (:v, :id)` range scan on the matching
+    composite index: page N costs the same as page 1. Returns (rows, next_cursor).
+    """
+    if cursor:
+        values = decode_cursor(scope, cursor)
+        if len(values) != len(columns):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        position = tuple_(*columns)
+        query = query.filter(position < tuple_(*values) if descending else position > tuple_(*values))
+
+    order = [column.desc() if descending else column.asc() for column in columns]
+    rows = query.order_by(*order).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    key = key or (lambda row: [getattr(row, column.key) for column in columns])
+    return rows, encode_cursor(scope, key(rows[-1]))
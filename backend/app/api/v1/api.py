@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 from app.api.v1.endpoints import (
-    auth, users, courses, storage, lessons, progress, dashboard, shop, payment, report, leaderboard
+    auth, users, courses, storage, lessons, progress, dashboard, shop, payment, report, leaderboard, export, bundles, sync
 )
 from app.api.v1.endpoints import payment
 from app.api.v1.endpoints import study
@@ -20,3 +20,6 @@ api_router.include_router(report.router, prefix="/reports", tags=["reports"])
 api_router.include_router(leaderboard.router, prefix="/leaderboard", tags=["leaderboard"])
 api_router.include_router(study.router, prefix="/study", tags=["study"])
 api_router.include_router(chat.router, prefix="/chat", tags=["chat"])
+api_router.include_router(export.router, prefix="/admin/exports", tags=["exports"])
+api_router.include_router(bundles.router, prefix="/bundles", tags=["bundles"])
+api_router.include_router(sync.router, prefix="/sync", tags=["sync"])
@@ -4,12 +4,15 @@ from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
 from fastapi.security import OAuth2PasswordRequestForm
 from app.services.email_service import email_service
 from app.services.tasks import send_welcome_email_task
+from app.services.leaderboard_service import leaderboard_registry
+from app.services import reward_service
 from sqlalchemy.orm import Session
 
 from app.core import security
 from app.core.config import settings
 from app.core.database import get_db
 from app.models.user import User, StudentProfile
+from app.models.enums import CurrencyType
 from app.schemas.token import Token
 from app.schemas.user import UserCreate, User as UserSchema
 
@@ -85,22 +88,23 @@ def register_user(
     
     # Create default Student Profile linked to this user
     # If Referred, add 100 Gems immediately to self (Referee)
-    initial_gems = 100 if referrer else 0
-    
     student_profile = StudentProfile(
         user_id=user.id,
         total_stars=0,
-        total_gems=initial_gems
+        total_gems=0
     )
     db.add(student_profile)
+    db.flush()
+
+    if referrer:
+        reward_service.award_points(db, student_profile, 100, CurrencyType.GEM, f"referred_by:{referrer.id}")
     
     # Add Reward to Referrer
     if referrer and referrer.student_profile:
-        referrer.student_profile.total_gems += 100
-        # Optional: Add PointLog or Notification logic here
-        db.add(referrer.student_profile)
+        reward_service.award_points(db, referrer.student_profile, 100, CurrencyType.GEM, f"referral:{user.id}")
         
     db.commit()
+    leaderboard_registry.update(student_profile.id, student_profile.total_stars)
     
     
     # Send Welcome Email
@@ -0,0 +1,75 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Request, Response
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.api.etag import make_etag, is_not_modified, not_modified, set_etag
+from app.schemas.bundle import CourseBundlesResponse, UnitBundleInfo
+from app.services import bundle_service
+from app.services.curriculum_service import curriculum_cache
+
+router = APIRouter()
+
+# A hash always names the same bytes
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@router.get("/courses/{course_id}", response_model=CourseBundlesResponse)
+def read_course_bundles(
+    course_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+) -> Any:
+    """
+    Offline packs of a course: the content hash of each unit's bundle.
+
+    Clients keep the bundles they already have and only download the units
+    whose hash changed.
+    """
+    snapshot = curriculum_cache.get(db)
+    course = snapshot.course_by_id.get(course_id)
+    if not course:
+        raise HTTPException(status_code=404, detail="Course not found")
+
+    etag = make_etag("bundles", course_id, snapshot.version)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    return CourseBundlesResponse(
+        course_id=course_id,
+        version=snapshot.version,
+        units=[
+            UnitBundleInfo(
+                unit_id=bundle.unit_id,
+                hash=bundle.content_hash,
+                size=bundle.size,
+                url=f"{settings.API_V1_STR}/bundles/{bundle.content_hash}"
+            )
+            for bundle in bundle_service.course_bundles(db, snapshot, course)
+        ]
+    )
+
+
+@router.get("/{content_hash}")
+def read_bundle(
+    request: Request,
+    content_hash: str = Path(..., pattern="^[0-9a-f]{64}$"),
+) -> Any:
+    """
+    Gzipped unit bundle by content hash, cacheable forever.
+    """
+    etag = make_etag(content_hash)
+    if is_not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL})
+    data = bundle_service.get_bundle(content_hash)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Bundle not found")
+    return Response(
+        content=data,
+        media_type="application/json",
+        headers={"Content-Encoding": "gzip", "ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+    )
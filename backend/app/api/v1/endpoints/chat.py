@@ -4,6 +4,11 @@ from typing import Any
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from app.api import deps
+from app.api.pagination import page_params, keyset_paginate
+from app.models.chat import ChatHistory
+from app.models.user import User
+from app.schemas.chat import ChatHistoryResponse
+from app.schemas.pagination import CursorPage
 from app.services.chat import chat_service
 
 router = APIRouter()
@@ -27,3 +32,21 @@ async def chat(
         media_type="text/plain; charset=utf-8"
     )
 
+@router.get("/history", response_model=CursorPage[ChatHistoryResponse])
+def read_chat_history(
+    page: tuple = Depends(page_params),
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Chat history of the current user, newest message first (keyset paginated).
+    """
+    cursor, limit = page
+    messages, next_cursor = keyset_paginate(
+        db.query(ChatHistory).filter(ChatHistory.user_id == current_user.id),
+        [ChatHistory.created_at, ChatHistory.id], "chat_history", cursor, limit, descending=True
+    )
+    return CursorPage[ChatHistoryResponse](
+        items=[ChatHistoryResponse.model_validate(message) for message in messages],
+        next_cursor=next_cursor
+    )
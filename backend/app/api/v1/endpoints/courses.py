@@ -1,23 +1,62 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from typing import List, Any
+import bisect
+from typing import List, Any, Optional
 from app.core.database import get_db
+from app.api.pagination import MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, encode_cursor, decode_cursor
 from app.models.curriculum import Course as CourseModel
 from app.schemas import course as course_schemas
+from app.services.curriculum_service import (
+    curriculum_cache, bump_content_version, tree_include, COURSE_FIELDS, MAX_DEPTH
+)
 
 router = APIRouter()
 
+FIELDS_DESCRIPTION = "Comma-separated course fields to return, e.g. id,title,level (default: all)"
+DEPTH_DESCRIPTION = "Levels of children: 0 course only, 1 + units, 2 + lessons, 3 + questions"
+
+
+def _parse_fields(fields: Optional[str]):
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - COURSE_FIELDS
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return requested
+
 @router.get("/", response_model=List[course_schemas.Course])
 def read_courses(
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page (replaces skip)"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    depth: int = Query(MAX_DEPTH, ge=0, le=MAX_DEPTH, description=DEPTH_DESCRIPTION),
 ) -> Any:
     """
-    Retrieve courses.
+    Retrieve courses by id. List views should ask for a summary, e.g. `?depth=0`.
+    Keyset paginated: the next page's cursor is in the X-Next-Cursor header.
     """
-    courses = db.query(CourseModel).offset(skip).limit(limit).all()
-    return courses
+    requested = _parse_fields(fields)
+    snapshot = curriculum_cache.get(db)
+    if cursor:
+        (after_id,) = decode_cursor("courses", cursor)
+        skip = bisect.bisect_right(snapshot.course_ids, after_id)
+    courses = snapshot.courses[skip:skip + limit]
+    headers = {}
+    if courses and skip + limit < len(snapshot.courses):
+        headers[NEXT_CURSOR_HEADER] = encode_cursor("courses", [courses[-1].id])
+    response.headers.update(headers)
+    if requested is None and depth == MAX_DEPTH:
+        return courses
+    include = tree_include(requested, depth)
+    return JSONResponse(
+        [course.model_dump(mode="json", include=include) for course in courses],
+        headers=headers
+    )
 
 @router.post("/", response_model=course_schemas.Course)
 def create_course(
@@ -35,6 +74,7 @@ def create_course(
         thumbnail_url=course_in.thumbnail_url,
     )
     db.add(course)
+    bump_content_version(db)
     db.commit()
     db.refresh(course)
     return course
@@ -43,11 +83,16 @@ def create_course(
 def read_course(
     course_id: int,
     db: Session = Depends(get_db),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    depth: int = Query(MAX_DEPTH, ge=0, le=MAX_DEPTH, description=DEPTH_DESCRIPTION),
 ) -> Any:
     """
     Get course by ID.
     """
-    course = db.query(CourseModel).filter(CourseModel.id == course_id).first()
+    requested = _parse_fields(fields)
+    course = curriculum_cache.get(db).course_by_id.get(course_id)
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
-    return course
+    if requested is None and depth == MAX_DEPTH:
+        return course
+    return JSONResponse(course.model_dump(mode="json", include=tree_include(requested, depth)))
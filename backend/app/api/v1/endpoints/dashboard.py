@@ -1,62 +1,121 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import asc
 
 from app.core.database import get_db
 from app.api import deps
+from app.api.etag import make_etag, is_not_modified, not_modified, set_etag
 from app.models.user import User, StudentProfile
-from app.models.curriculum import Unit, Lesson
-from app.models.progress import LessonProgress, QuizResult
+from app.models.user_course import UserCourse
+from app.models.progress import LessonQuizSummary
 from app.schemas.dashboard import DashboardPathResponse, UnitDashboardResponse, LessonDashboardResponse
+from app.services import completion_service
+from app.services.curriculum_service import curriculum_cache
 
 router = APIRouter()
 
+# Units returned per page of the learning path
+PATH_WINDOW_UNITS = 3
+MAX_PATH_WINDOW_UNITS = 10
+
 @router.get("/path", response_model=DashboardPathResponse)
 def get_learning_path(
+    request: Request,
+    response: Response,
+    course_id: Optional[int] = None,
+    before: Optional[int] = Query(None, description="Unit id: return the units just before it"),
+    after: Optional[int] = Query(None, description="Unit id: return the units just after it"),
+    limit: int = Query(PATH_WINDOW_UNITS, ge=1, le=MAX_PATH_WINDOW_UNITS),
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.get_current_user)
 ) -> Any:
+    """
+    Learning path of one course, a window of units at a time.
+
+    Without a cursor the window is centred on the student's current unit;
+    `prev_cursor` / `next_cursor` expand it in either direction. Without
+    `course_id`, the most recently purchased active course is used (else the first course).
+    """
     # 1. Get Student Profile
     student = db.query(StudentProfile).filter(StudentProfile.user_id == current_user.id).first()
     if not student:
         raise HTTPException(status_code=404, detail="Student profile not found")
+    if before is not None and after is not None:
+        raise HTTPException(status_code=400, detail="Use either before or after, not both")
 
-    # 2. Fetch all Units and Lessons (Assuming single course for now or filtering by level/course needed in future)
-    # For MVP, we fetch all units ordered by index
-    units = db.query(Unit).order_by(asc(Unit.order_index)).all()
+    # Same student state + same curriculum => same path (the URL carries course/cursor/limit)
+    snapshot = curriculum_cache.get(db)
+    etag = make_etag("path", student.id, student.state_version, snapshot.version)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
 
-    # 3. Fetch User Progress maps
-    progress_records = db.query(LessonProgress).filter(LessonProgress.student_id == student.id).all()
-    completed_map = {p.lesson_id: p.is_completed for p in progress_records}
-    
-    quiz_records = db.query(QuizResult).filter(QuizResult.student_id == student.id).all()
-    score_map = {q.lesson_id: q.score for q in quiz_records}
+    # 2. Resolve the course from the cached curriculum snapshot
+    if course_id is None:
+        held_course_ids = [
+            c_id for (c_id,) in db.query(UserCourse.course_id)
+            .filter(UserCourse.user_id == current_user.id, UserCourse.is_active == True)
+            .order_by(UserCourse.purchased_at.desc())
+            .all()
+        ]
+        course_id = next((c_id for c_id in held_course_ids if c_id in snapshot.course_by_id), None)
+        if course_id is None and snapshot.courses:
+            course_id = snapshot.courses[0].id
+        if course_id is None:
+            return DashboardPathResponse(units=[])
+    course = snapshot.course_by_id.get(course_id)
+    if not course:
+        raise HTTPException(status_code=404, detail="Course not found")
+    units = course.units
+    chain = snapshot.course_lesson_ids[course.id]
 
-    # 4. Build Response with Lock Logic
-    units_response = []
-    
-    # Global sequential lock tracker
-    # The first lesson of the first unit is always unlocked.
-    # Subsequent lessons are unlocked ONLY if the previous one is completed.
-    previous_lesson_completed = True 
+    # 3. Completed lessons, from the student's completion bitmap (one bit per lesson)
+    mask = completion_service.to_mask(student.completion_bitmap)
+
+    # 4. Current unit = the one holding the next unlocked lesson (first one not completed yet)
+    unit_index = {unit.id: index for index, unit in enumerate(units)}
+    next_index = completion_service.first_incomplete(mask, chain)
+    next_lesson_id = chain[next_index] if next_index is not None else None
+    current = next(
+        (index for index, unit in enumerate(units) if any(l.id == next_lesson_id for l in unit.lessons)),
+        len(units) - 1
+    )
 
-    for unit in units:
+    # 5. Window of units
+    if after is not None or before is not None:
+        cursor = unit_index.get(after if after is not None else before)
+        if cursor is None:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if after is not None:
+            start, end = cursor + 1, min(cursor + 1 + limit, len(units))
+        else:
+            start, end = max(cursor - limit, 0), cursor
+    else:
+        # One unit of context behind the current one
+        start = max(min(current - 1, len(units) - limit), 0)
+        end = min(start + limit, len(units))
+    window = units[start:end]
+
+    # Best score per lesson of the window, from the maintained quiz summary
+    window_lesson_ids = [lesson.id for unit in window for lesson in unit.lessons]
+    score_map = dict(
+        db.query(LessonQuizSummary.lesson_id, LessonQuizSummary.best_score)
+        .filter(
+            LessonQuizSummary.student_id == student.id,
+            LessonQuizSummary.lesson_id.in_(window_lesson_ids)
+        )
+        .all()
+    ) if window_lesson_ids else {}
+
+    # 6. Build Response with Lock Logic
+    # Sequential lock along the course chain: the first lesson of the course is
+    # always unlocked, every other one only once the lesson before it is completed.
+    units_response = []
+    for unit in window:
         lessons_response = []
-        # Sort lessons within unit just in case
-        sorted_lessons = sorted(unit.lessons, key=lambda x: x.order_index)
-        
-        for lesson in sorted_lessons:
-            is_completed = completed_map.get(lesson.id, False)
-            score = score_map.get(lesson.id, 0)
-            
-            # Determine Lock Status
-            is_locked = not previous_lesson_completed
-            
-            # Update tracker for next iteration
-            # If THIS lesson is completed, the NEXT one will be unlocked.
-            # If this lesson is NOT completed, the next one stays locked.
-            previous_lesson_completed = is_completed
+        for lesson in unit.lessons:
+            ordinal = snapshot.lesson_ordinals[lesson.id]
+            is_locked = ordinal > 0 and not completion_service.is_completed(mask, chain[ordinal - 1])
 
             lessons_response.append(LessonDashboardResponse(
                 id=lesson.id,
@@ -65,8 +124,8 @@ def get_learning_path(
                 thumbnail_url=lesson.thumbnail_url,
                 order_index=lesson.order_index,
                 is_locked=is_locked,
-                is_completed=is_completed,
-                score=score
+                is_completed=completion_service.is_completed(mask, lesson.id),
+                score=score_map.get(lesson.id, 0)
             ))
         
         units_response.append(UnitDashboardResponse(
@@ -76,4 +135,11 @@ def get_learning_path(
             lessons=lessons_response
         ))
 
-    return DashboardPathResponse(units=units_response)
+    return DashboardPathResponse(
+        course_id=course.id,
+        current_unit_id=units[current].id if units else None,
+        next_lesson_id=next_lesson_id,
+        units=units_response,
+        prev_cursor=window[0].id if window and start > 0 else None,
+        next_cursor=window[-1].id if window and end < len(units) else None,
+    )
@@ -0,0 +1,68 @@
+from datetime import date, datetime
+from typing import Any, Literal, Optional
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from app.api import deps
+from app.models.enums import OrderStatus
+from app.models.user import User
+from app.services import export_service
+
+router = APIRouter()
+
+
+def _csv_response(stmt, columns, name: str) -> StreamingResponse:
+    filename = f"{name}_{datetime.utcnow():%Y%m%d_%H%M%S}.csv"
+    return StreamingResponse(
+        export_service.stream_csv(stmt, columns),
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/quiz-results")
+def export_quiz_results(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    course_id: Optional[int] = None,
+    status: Optional[Literal["passed", "failed"]] = None,
+    current_user: User = Depends(deps.get_current_admin),
+) -> Any:
+    """
+    Stream quiz results as CSV (admin only). Dates are local days, both inclusive.
+    """
+    passed = None if status is None else status == "passed"
+    stmt = export_service.quiz_results_query(start_date, end_date, course_id, passed)
+    return _csv_response(stmt, export_service.QUIZ_RESULT_COLUMNS, "quiz_results")
+
+
+@router.get("/lesson-progress")
+def export_lesson_progress(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    course_id: Optional[int] = None,
+    status: Optional[Literal["completed", "in_progress"]] = None,
+    current_user: User = Depends(deps.get_current_admin),
+) -> Any:
+    """
+    Stream lesson progress as CSV (admin only), filtered on the last update.
+    """
+    is_completed = None if status is None else status == "completed"
+    stmt = export_service.lesson_progress_query(start_date, end_date, course_id, is_completed)
+    return _csv_response(stmt, export_service.LESSON_PROGRESS_COLUMNS, "lesson_progress")
+
+
+@router.get("/orders")
+def export_orders(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    course_id: Optional[int] = None,
+    status: Optional[OrderStatus] = None,
+    current_user: User = Depends(deps.get_current_admin),
+) -> Any:
+    """
+    Stream orders as CSV (admin only). `course_id` keeps course purchases of that course.
+    """
+    stmt = export_service.orders_query(start_date, end_date, course_id, status)
+    return _csv_response(stmt, export_service.ORDER_COLUMNS, "orders")
@@ -1,167 +1,247 @@
-from typing import Any, List, Optional
+from typing import Any, Optional, Tuple
 from enum import Enum
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, date
 
 from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
 
 from app.api import deps
 from app.core.database import get_db
 from app.models.user import User, StudentProfile
-from app.models.gamification import PointLog, CurrencyType
 from app.schemas.leaderboard import LeaderboardResponse, LeaderboardEntry
+from app.models.enums import CourseLevel
+from app.services.leaderboard_broadcast import leaderboard_broadcaster
+from app.services.leaderboard_service import (
+    GLOBAL_SCOPE, ScopeKey, leaderboard_engine, leaderboard_registry, ranked_window, scope_student_ids, window_scores
+)
 
 router = APIRouter()
 
 class LeaderboardPeriod(str, Enum):
     ALL_TIME = "all_time"
     WEEKLY = "weekly"
+    MONTHLY = "monthly"
+    CUSTOM = "custom"
+
+TOP_LIMIT = 10
+MAX_AROUND = 25
+MAX_CUSTOM_WINDOW_DAYS = 366
+
+
+class LeaderboardScope(str, Enum):
+    GLOBAL = "global"
+    LEVEL = "level"          # Students holding a course of the given level
+    COURSE = "course"        # Students holding the given course
+    HOUSEHOLD = "household"  # Siblings under the current student's parent
+
+
+def resolve_window(
+    period: LeaderboardPeriod,
+    start_date: Optional[date],
+    end_date: Optional[date],
+) -> Tuple[date, date]:
+    """
+    Inclusive (start_day, end_day) in UTC days for a windowed leaderboard.
+    """
+    today = datetime.utcnow().date()
+    if period == LeaderboardPeriod.WEEKLY:
+        return today - timedelta(days=6), today
+    if period == LeaderboardPeriod.MONTHLY:
+        return today - timedelta(days=29), today
+
+    if not start_date:
+        raise HTTPException(status_code=400, detail="start_date is required for a custom period")
+    end_date = end_date or today
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+    if (end_date - start_date).days >= MAX_CUSTOM_WINDOW_DAYS:
+        raise HTTPException(status_code=400, detail=f"Custom period cannot exceed {MAX_CUSTOM_WINDOW_DAYS} days")
+    return start_date, end_date
+
+def resolve_scope(
+    scope: LeaderboardScope,
+    level: Optional[CourseLevel],
+    course_id: Optional[int],
+    student: StudentProfile,
+) -> ScopeKey:
+    if scope == LeaderboardScope.GLOBAL:
+        return GLOBAL_SCOPE
+    if scope == LeaderboardScope.LEVEL:
+        if not level:
+            raise HTTPException(status_code=400, detail="level is required for a level leaderboard")
+        return ("level", level)
+    if scope == LeaderboardScope.COURSE:
+        if not course_id:
+            raise HTTPException(status_code=400, detail="course_id is required for a course leaderboard")
+        return ("course", course_id)
+    if not student.parent_id:
+        raise HTTPException(status_code=400, detail="Student is not linked to a parent")
+    return ("household", student.parent_id)
 
 @router.get("/", response_model=LeaderboardResponse)
 def get_leaderboard(
     period: LeaderboardPeriod = Query(LeaderboardPeriod.ALL_TIME),
+    start_date: Optional[date] = Query(None, description="First day (UTC) of a custom period"),
+    end_date: Optional[date] = Query(None, description="Last day (UTC) of a custom period, defaults to today"),
+    around: int = Query(0, ge=0, le=MAX_AROUND, description="Neighbours to return above and below the current user"),
+    scope: LeaderboardScope = Query(LeaderboardScope.GLOBAL),
+    level: Optional[CourseLevel] = Query(None, description="Course level for scope=level"),
+    course_id: Optional[int] = Query(None, description="Course for scope=course"),
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.get_current_user),
 ) -> Any:
     """
-    Get leaderboard data (Top 10 users).
+    Get leaderboard data (Top 10 users), optionally with the players around the current user.
     """
     if not current_user.student_profile:
         raise HTTPException(status_code=400, detail="User is not a student")
 
     current_student_id = current_user.student_profile.id
-    
-    top_entries = []
-    user_rank_entry = None
+    scope_key = resolve_scope(scope, level, course_id, current_user.student_profile)
 
     if period == LeaderboardPeriod.ALL_TIME:
-        # Query Top 10 by total_stars
-        top_students = (
-            db.query(StudentProfile)
-            .join(User, StudentProfile.user_id == User.id)
-            .order_by(desc(StudentProfile.total_stars))
-            .limit(10)
-            .all()
-        )
-        
-        # Build response list
-        for idx, student in enumerate(top_students):
-            entry = LeaderboardEntry(
-                rank=idx + 1,
-                student_id=student.id,
-                full_name=student.user.full_name,
-                avatar_url=student.avatar_url,
-                stars=student.total_stars,
-                is_current_user=(student.id == current_student_id)
-            )
-            top_entries.append(entry)
-            if entry.is_current_user:
-                user_rank_entry = entry
-
-        # If user not in top 10, calculate their rank
-        if not user_rank_entry:
-            user_stars = current_user.student_profile.total_stars
-            better_count = (
-                db.query(StudentProfile)
-                .filter(StudentProfile.total_stars > user_stars)
-                .count()
-            )
-            user_rank_entry = LeaderboardEntry(
-                rank=better_count + 1,
-                student_id=current_student_id,
-                full_name=current_user.full_name,
-                avatar_url=current_user.student_profile.avatar_url,
-                stars=user_stars,
-                is_current_user=True
-            )
+        # Ranking is served from the scope's in-memory engine; profiles are read in one query
+        engine = leaderboard_registry.get(db, scope_key)
+        if scope_key == GLOBAL_SCOPE:
+            # The caller's own total was just loaded, so keep the engine in step with it
+            engine.update(current_student_id, current_user.student_profile.total_stars)
+        elif current_student_id not in engine:
+            raise HTTPException(status_code=403, detail="You are not part of this leaderboard")
 
-    else: # Weekly
-        start_date = datetime.utcnow() - timedelta(days=7)
-        
-        # Subquery to calculate weekly stars per student
-        # We assume PointLog tracks positive star changes
-        weekly_scores = (
-            db.query(
-                PointLog.student_id,
-                func.sum(PointLog.change_amount).label("weekly_stars")
-            )
-            .filter(
-                PointLog.created_at >= start_date,
-                PointLog.currency_type == CurrencyType.STAR,
-                PointLog.change_amount > 0 
+        top_ranked = engine.top(TOP_LIMIT)
+        around_ranked = engine.around(current_student_id, around) if around else []
+        user_ranked = [
+            (engine.rank(current_student_id), current_student_id, engine.stars(current_student_id))
+        ]
+
+        student_ids = {s_id for _, s_id, _ in top_ranked + around_ranked}
+        profiles = {
+            s_id: (full_name, avatar_url)
+            for s_id, full_name, avatar_url in (
+                db.query(StudentProfile.id, User.full_name, StudentProfile.avatar_url)
+                .join(User, StudentProfile.user_id == User.id)
+                .filter(StudentProfile.id.in_(student_ids))
+                .all()
             )
-            .group_by(PointLog.student_id)
-            .order_by(desc("weekly_stars"))
-            .all()
-        )
-        
-        # Map results to full profiles
-        # Since we need full name, we might need to fetch profiles.
-        # Given limit 10, we can fetch manually or do a more complex join.
-        # Let's do simple fetch for the top 10.
-        
-        top_scores = weekly_scores[:10]
-        
-        for idx, (s_id, score) in enumerate(top_scores):
-            student = db.query(StudentProfile).filter(StudentProfile.id == s_id).first()
-            if student:
-                 entry = LeaderboardEntry(
-                    rank=idx + 1,
+        }
+        profiles[current_student_id] = (current_user.full_name, current_user.student_profile.avatar_url)
+
+        def to_entries(ranked):
+            return [
+                LeaderboardEntry(
+                    rank=rank,
                     student_id=s_id,
-                    full_name=student.user.full_name,
-                    avatar_url=student.avatar_url,
-                    stars=score or 0,
+                    full_name=profiles[s_id][0],
+                    avatar_url=profiles[s_id][1],
+                    stars=stars,
                     is_current_user=(s_id == current_student_id)
                 )
-                 top_entries.append(entry)
-                 if entry.is_current_user:
-                     user_rank_entry = entry
-
-        # Logic for user if not in top 10
-        if not user_rank_entry:
-            # Find user's score in the full list
-            # Optimize: querying all grouped by is heavy if many users. 
-            # For MVP, fetching user's specific sum is faster.
-            
-            user_weekly_score = (
-                db.query(func.sum(PointLog.change_amount))
-                .filter(
-                    PointLog.student_id == current_student_id,
-                    PointLog.created_at >= start_date,
-                    PointLog.currency_type == CurrencyType.STAR,
-                    PointLog.change_amount > 0
-                )
-                .scalar()
-            ) or 0
-            
-            # Find rank: Count users with score > user_weekly_score
-            # This requires a subquery or having clause.
-            #   SELECT count(*) FROM (SELECT sum(amount) as s FROM logs GROUP BY student_id) WHERE s > my_score
-            
-            subquery = (
-                db.query(func.sum(PointLog.change_amount).label("score"))
-                .filter(
-                    PointLog.created_at >= start_date,
-                    PointLog.currency_type == CurrencyType.STAR,
-                    PointLog.change_amount > 0
+                for rank, s_id, stars in ranked
+                if s_id in profiles
+            ]
+
+        top_entries = to_entries(top_ranked)
+        around_entries = to_entries(around_ranked)
+        user_rank_entry = to_entries(user_ranked)[0]
+
+    else: # Windowed (weekly / monthly / custom)
+        start_day, end_day = resolve_window(period, start_date, end_date)
+
+        member_ids = scope_student_ids(scope_key)
+        if member_ids is not None:
+            is_member = db.query(member_ids.where(StudentProfile.id == current_student_id).exists()).scalar()
+            if not is_member:
+                raise HTTPException(status_code=403, detail="You are not part of this leaderboard")
+
+        # Top N, the caller and their neighbours in one window-function query
+        rows = ranked_window(
+            db,
+            window_scores(start_day, end_day, current_student_id, scope_key),
+            current_student_id,
+            limit=TOP_LIMIT,
+            radius=around
+        )
+
+        entries = [
+            (
+                position,
+                LeaderboardEntry(
+                    rank=rank,
+                    student_id=s_id,
+                    full_name=full_name,
+                    avatar_url=avatar_url,
+                    stars=stars or 0,
+                    is_current_user=(s_id == current_student_id)
                 )
-                .group_by(PointLog.student_id)
-                .subquery()
-            )
-            
-            better_count = db.query(func.count()).filter(subquery.c.score > user_weekly_score).scalar()
-            
-            user_rank_entry = LeaderboardEntry(
-                rank=better_count + 1,
-                student_id=current_student_id,
-                full_name=current_user.full_name,
-                avatar_url=current_user.student_profile.avatar_url,
-                stars=user_weekly_score,
-                is_current_user=True
             )
+            for rank, position, s_id, stars, full_name, avatar_url in rows
+        ]
+        my_position = next(position for position, entry in entries if entry.is_current_user)
+
+        top_entries = [entry for position, entry in entries if position <= TOP_LIMIT]
+        around_entries = [
+            entry for position, entry in entries
+            if around and abs(position - my_position) <= around
+        ]
+        user_rank_entry = next(entry for _, entry in entries if entry.is_current_user)
 
     return LeaderboardResponse(
         top_users=top_entries,
-        user_rank=user_rank_entry
+        user_rank=user_rank_entry,
+        around_user=around_entries
     )
+
+
+@router.get("/stream")
+async def stream_leaderboard(
+    scope: LeaderboardScope = Query(LeaderboardScope.GLOBAL),
+    level: Optional[CourseLevel] = Query(None, description="Course level for scope=level"),
+    course_id: Optional[int] = Query(None, description="Course for scope=course"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Server-Sent Events stream of the all-time leaderboard.
+
+    The first `leaderboard` event carries the full top list and the user's rank;
+    later events (at most one per second) only carry the parts that changed.
+    """
+    student = current_user.student_profile
+    if not student:
+        raise HTTPException(status_code=400, detail="User is not a student")
+
+    scope_key = resolve_scope(scope, level, course_id, student)
+    engine = await run_in_threadpool(leaderboard_registry.get, db, scope_key)
+    if scope_key == GLOBAL_SCOPE:
+        engine.update(student.id, student.total_stars)
+    elif student.id not in engine:
+        raise HTTPException(status_code=403, detail="You are not part of this leaderboard")
+
+    return StreamingResponse(
+        leaderboard_broadcaster.stream(scope_key, student.id, current_user.full_name, student.avatar_url),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/consistency")
+def check_leaderboard_consistency(
+    repair: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_admin),
+) -> Any:
+    """
+    Compare the in-memory all-time ranking with student_profiles (admin only).
+    """
+    leaderboard_engine.ensure_loaded(db)
+    mismatches = leaderboard_engine.check_consistency(db, repair=repair)
+    return {
+        "students": len(leaderboard_engine),
+        "mismatches": [
+            {"student_id": s_id, "memory_stars": memory, "db_stars": stored}
+            for s_id, (memory, stored) in mismatches.items()
+        ],
+        "repaired": repair,
+    }
@@ -1,21 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from typing import Any
 from app.core.database import get_db
-from app.models.curriculum import Lesson as LessonModel
+from app.api.etag import make_etag, is_not_modified, not_modified, CACHE_CONTROL
 from app.schemas import course as course_schemas
+from app.services.curriculum_service import curriculum_cache, lesson_payload_cache
 
 router = APIRouter()
 
 @router.get("/{lesson_id}", response_model=course_schemas.Lesson)
 def read_lesson(
     lesson_id: int,
+    request: Request,
     db: Session = Depends(get_db),
 ) -> Any:
     """
     Get lesson by ID.
+
+    Served as pre-encoded JSON from the per-worker lesson cache; the ETag
+    changes with the curriculum version.
     """
-    lesson = db.query(LessonModel).filter(LessonModel.id == lesson_id).first()
-    if not lesson:
+    snapshot = curriculum_cache.get(db)
+    if lesson_id not in snapshot.lesson_by_id:
         raise HTTPException(status_code=404, detail="Lesson not found")
-    return lesson
+
+    etag = make_etag("lesson", lesson_id, snapshot.version)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    return Response(
+        content=lesson_payload_cache.get(snapshot, lesson_id),
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    )
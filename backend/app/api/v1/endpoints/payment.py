@@ -6,13 +6,17 @@ from app.models.order import Order, OrderStatus
 from app.models.coupon import Coupon
 from app.models.enums import DiscountType
 from app.models.user import User
-from app.schemas.order import OrderCreate, OrderResponse, WebhookPayload, SePayWebhookRequest, SePayWebhookResponse
+from app.schemas.order import OrderCreate, OrderResponse, OrderSummary, WebhookPayload, SePayWebhookRequest, SePayWebhookResponse
+from app.schemas.pagination import CursorPage
+from app.api.pagination import page_params, keyset_paginate
 from app.schemas.coupon import CouponValidateRequest, CouponValidateResponse
 from datetime import datetime
 from app.services.storage import minio_handler
 from app.services.email_service import email_service
 from app.services.tasks import send_payment_success_email_task
 from app.services.payment_service import PaymentService
+from app.services.leaderboard_service import leaderboard_registry
+from app.services.student_state_service import bump_state_version, bump_user_state_version
 from app.models.gem_pack import GemPack
 from app.schemas.gem_pack import GemPackResponse, CreateGemOrderRequest, GemOrderResponse
 import uuid
@@ -251,6 +255,7 @@ async def payment_webhook(
              # Let's assume 1000 VND = 1 Gem
              gems_to_add = int(order.amount / 1000)
              order.user.student_profile.total_gems += gems_to_add
+             bump_state_version(order.user.student_profile)
              db.commit()
              print(f"Added {gems_to_add} gems to user {order.user.email}")
              
@@ -279,6 +284,38 @@ async def payment_webhook(
     
     return {"status": "success", "order_id": order_id}
 
+@router.get("/orders", response_model=CursorPage[OrderSummary])
+def list_orders(
+    page: tuple = Depends(page_params),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user),
+):
+    """
+    Order history of the current user, newest first (keyset paginated).
+    """
+    cursor, limit = page
+    orders, next_cursor = keyset_paginate(
+        db.query(Order).filter(Order.user_id == current_user.id),
+        [Order.created_at, Order.id], "orders", cursor, limit, descending=True
+    )
+    return CursorPage[OrderSummary](
+        items=[
+            OrderSummary(
+                order_id=order.order_id,
+                amount=order.amount,
+                discount_amount=order.discount_amount or 0.0,
+                description=order.description,
+                status=order.status.value if order.status else OrderStatus.PENDING.value,
+                item_type=order.item_type,
+                item_id=order.item_id,
+                coupon_code=order.coupon_code,
+                created_at=order.created_at,
+            )
+            for order in orders
+        ],
+        next_cursor=next_cursor
+    )
+
 @router.get("/orders/{order_id}", response_model=OrderResponse)
 def get_order(
     order_id: str,
@@ -555,6 +592,8 @@ async def sepay_payment_webhook(
                         notes=f"Auto-activated from webhook {transaction.id}"
                     )
                     db.add(user_course)
+                    # The default course of the learning path may change
+                    bump_user_state_version(db, order.user_id)
                     logger.info(f"Activated course {order.item_id} for user {order.user_id}")
                 else:
                     logger.warning(f"User {order.user_id} already has course {order.item_id}")
@@ -601,6 +640,11 @@ async def sepay_payment_webhook(
         
         # Commit transaction
         db.commit()
+
+        if order.item_type == "course":
+            # Course/level leaderboards are rebuilt with the new member on next use
+            leaderboard_registry.invalidate("course")
+            leaderboard_registry.invalidate("level")
         
         logger.info(f"Order {order_id} payment processed successfully")
         
@@ -1,120 +1,154 @@
+import logging
+from datetime import datetime, timedelta, timezone
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.models.enums import LearningEventType
 from app.models.progress import LessonProgress
 from app.models.user import StudentProfile, User
-from app.models.curriculum import Lesson
-from app.schemas.progress import ProgressUpdate, ProgressResponse
+from app.schemas.progress import (
+    ProgressUpdate, ProgressResponse, ProgressBatchRequest, ProgressBatchResponse,
+    WatchHeartbeat, WatchPositionResponse, LearningEventBatch, LearningEventBatchResponse
+)
 from app.api import deps
-from app.services import study_service
-from datetime import datetime
-from app.models.progress import LessonProgress, QuizResult
+from app.services import progress_service, study_service
+from app.services.tasks import initialize_lesson_vocabulary_task
+from app.services.watch_position_service import watch_position_buffer
+from app.services.learning_event_service import learning_event_writer
+from app.services.leaderboard_service import leaderboard_registry
+from app.services.leaderboard_broadcast import leaderboard_broadcaster
+
+logger = logging.getLogger(__name__)
+
+# Offline clients may upload events late, but not older than this
+MAX_EVENT_AGE = timedelta(days=7)
 
 router = APIRouter()
 
 
+def _submit(db: Session, current_user: User, submissions: list[ProgressUpdate]) -> list[ProgressResponse]:
+    # 1. Find Student Profile associated with User
+    student = db.query(StudentProfile).filter(StudentProfile.user_id == current_user.id).first()
+    if not student:
+        raise HTTPException(status_code=404, detail="Student profile not found for this user")
+
+    # 2. Apply every submission, then save all changes in one transaction
+    try:
+        results, newly_completed_lessons = progress_service.apply_submissions(db, student, submissions)
+    except progress_service.UnknownLessonsError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    db.commit()
+
+    if any(result.earned_stars for result in results):
+        changed_scopes = leaderboard_registry.update(student.id, student.total_stars)
+        leaderboard_broadcaster.publish(changed_scopes)
+
+    # 3. SRS Initialization only on first completion, off the request path
+    if newly_completed_lessons:
+        try:
+            initialize_lesson_vocabulary_task.delay(current_user.id, newly_completed_lessons)
+        except Exception as e:
+            # Broker unavailable: seed inline, the job is idempotent
+            logger.error(f"Failed to enqueue vocabulary initialization: {e}")
+            study_service.initialize_lessons_vocabulary(db, current_user.id, newly_completed_lessons)
+
+    return results
+
+
 @router.post("/mark-complete", response_model=ProgressResponse)
 def mark_lesson_complete(
     data: ProgressUpdate,
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.get_current_user)
 ):
-    # 1. Find Student Profile associated with User
-    student = db.query(StudentProfile).filter(StudentProfile.user_id == current_user.id).first()
-    if not student:
+    return _submit(db, current_user, [data])[0]
+
+
+@router.post("/batch", response_model=ProgressBatchResponse)
+def mark_lessons_batch(
+    data: ProgressBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """
+    Apply several lesson completions / quiz results (e.g. made offline) in one transaction.
+    Items are applied in order with the same rewards as /mark-complete.
+    """
+    results = _submit(db, current_user, data.items)
+    return ProgressBatchResponse(
+        results=results,
+        earned_gems=sum(result.earned_gems for result in results),
+        earned_stars=sum(result.earned_stars for result in results)
+    )
+
+
+def _get_student_id(db: Session, current_user: User) -> int:
+    student_id = db.query(StudentProfile.id).filter(StudentProfile.user_id == current_user.id).scalar()
+    if student_id is None:
         raise HTTPException(status_code=404, detail="Student profile not found for this user")
+    return student_id
+
 
-    # 2. Find or Create LessonProgress
-    progress = db.query(LessonProgress).filter(
-        LessonProgress.student_id == student.id,
-        LessonProgress.lesson_id == data.lesson_id
-    ).first()
-
-    earned_gems = 0
-    earned_stars = 0
-    
-    # 3. Determine Pass/Completion Status
-    # - If total_questions == 0 (Video only): Always passed/completed
-    # - If total_questions > 0 (Quiz): Passed only if score >= threshold
-    
-    passed_quiz = False
-    is_lesson_passed = False
-    
-    if data.total_questions > 0:
-        pass_threshold = 0.6
-        performance = data.score / data.total_questions
-        if performance >= pass_threshold:
-            passed_quiz = True
-            is_lesson_passed = True
-    else:
-        # Video completion
-        is_lesson_passed = True
-
-    # 4. Update LessonProgress (Completion Logic - Gems)
-    is_newly_completed = False
-    
-    if not progress:
-        progress = LessonProgress(
-            student_id=student.id,
-            lesson_id=data.lesson_id,
-            is_completed=is_lesson_passed, 
-            updated_at=datetime.utcnow()
+@router.post("/heartbeat", response_model=WatchPositionResponse)
+def watch_heartbeat(
+    data: WatchHeartbeat,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """
+    Called by the lesson player every few seconds. Positions are buffered and
+    written in batches; `paused=true` gets this position written right away.
+    """
+    student_id = _get_student_id(db, current_user)
+    watch_position_buffer.record(student_id, data.lesson_id, data.position, flush=data.paused)
+    if data.session_id:
+        learning_event_writer.record(
+            student_id, data.session_id, LearningEventType.HEARTBEAT, data.lesson_id, data.position
         )
-        db.add(progress)
-        if is_lesson_passed:
-            is_newly_completed = True
-    else:
-        # Only mark complete if currently passed and not already complete
-        if not progress.is_completed and is_lesson_passed:
-            progress.is_completed = True
-            is_newly_completed = True
-        progress.updated_at = datetime.utcnow()
-    
-    # Award Gems if newly completed (Video watched OR Quiz passed first time)
-    if is_newly_completed:
-        earned_gems = 10
-        student.total_gems += earned_gems
-        
-        # Trigger SRS Initialization only on first completion
-        lesson = db.query(Lesson).filter(Lesson.id == data.lesson_id).first()
-        if lesson and lesson.vocabulary:
-            study_service.initialize_lesson_vocabulary(db, current_user.id, lesson.vocabulary)
-
-    # 5. Quiz Logic (Stars) - Only if Quiz submitted
-    if data.total_questions > 0:
-        # Record Quiz Result
-        quiz_result = QuizResult(
-            student_id=student.id,
-            lesson_id=data.lesson_id,
-            score=data.score,
-            total_questions=data.total_questions,
-            passed=passed_quiz,
-            created_at=datetime.utcnow()
+    return WatchPositionResponse(lesson_id=data.lesson_id, position=data.position)
+
+
+@router.get("/position/{lesson_id}", response_model=WatchPositionResponse)
+def get_watch_position(
+    lesson_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """
+    Where to resume the lesson video, including heartbeats not flushed yet.
+    """
+    student_id = _get_student_id(db, current_user)
+    position = watch_position_buffer.get_position(student_id, lesson_id)
+    if position is None:
+        position = db.query(LessonProgress.last_watched_position).filter(
+            LessonProgress.student_id == student_id,
+            LessonProgress.lesson_id == lesson_id
+        ).scalar()
+    return WatchPositionResponse(lesson_id=lesson_id, position=position or 0)
+
+
+@router.post("/events", response_model=LearningEventBatchResponse)
+def record_learning_events(
+    data: LearningEventBatch,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """
+    Append session start / heartbeat / end events to the learning log (buffered).
+    Events from the future are stamped now; events older than 7 days are ignored.
+    """
+    student_id = _get_student_id(db, current_user)
+    now = datetime.utcnow()
+    accepted = 0
+    for event in data.events:
+        occurred_at = event.occurred_at or now
+        if occurred_at.tzinfo is not None:
+            occurred_at = occurred_at.astimezone(timezone.utc).replace(tzinfo=None)
+        occurred_at = min(occurred_at, now)
+        if occurred_at < now - MAX_EVENT_AGE:
+            continue
+        learning_event_writer.record(
+            student_id, event.session_id, event.event_type, event.lesson_id, event.position, occurred_at
         )
-        db.add(quiz_result)
-        
-        # Award Stars only if Passed Quiz
-        if passed_quiz:
-            # Check if user has EVER passed this quiz before
-            previously_passed = db.query(QuizResult).filter(
-                QuizResult.student_id == student.id,
-                QuizResult.lesson_id == data.lesson_id,
-                QuizResult.passed == True
-            ).count() > 0
-            
-            if not previously_passed:
-                earned_stars = 3
-                student.total_stars += earned_stars
-
-    # Save all changes
-    db.add(student) # ensure student update is tracked
-    db.commit()
-    db.refresh(progress)
-
-    return ProgressResponse(
-        message="Lesson updated",
-        is_completed=progress.is_completed,
-        updated_at=progress.updated_at,
-        earned_gems=earned_gems,
-        earned_stars=earned_stars
-    )
+        accepted += 1
+    return LearningEventBatchResponse(accepted=accepted)
@@ -1,15 +1,13 @@
 from typing import Any
-from datetime import datetime, timedelta, date
+from datetime import timedelta
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 
 from app.api import deps
-from app.models.user import User
-from app.models.progress import LessonProgress, QuizResult
-from app.models.curriculum import Lesson, VideoMaterial
-from app.schemas.report import WeeklyReportResponse, DailyProgress
+from app.models.user import User, StudentProfile
+from app.schemas.report import WeeklyReportResponse, HouseholdReportResponse, ChildWeeklyReport
+from app.services import activity_service, report_service
 
 router = APIRouter()
 
@@ -26,105 +24,43 @@ def get_weekly_report(
 
     student_id = current_user.student_profile.id
     
-    # Calculate date range (Last 7 days)
-    today = datetime.utcnow().date()
-    start_date = today - timedelta(days=6) # 7 days including today
-    start_datetime = datetime.combine(start_date, datetime.min.time())
+    # Calculate date range (Last 7 local days, including today)
+    today = activity_service.local_today()
+    start_date = today - timedelta(days=6)
 
-    # 1. Calculate Daily Progress (Minutes)
-    # Strategy: 
-    # - Fetch modified progress records in the last 7 days.
-    # - Estimate time: 
-    #   - If completed: use video duration (or default 10 mins if missing)
-    #   - If not completed: use last_watched_position (seconds)
-    # - Note: This is an estimation. Real tracking would require a detailed session log.
-    
-    progress_records = (
-        db.query(LessonProgress, Lesson, VideoMaterial)
-        .join(Lesson, LessonProgress.lesson_id == Lesson.id)
-        .outerjoin(VideoMaterial, Lesson.id == VideoMaterial.lesson_id)
-        .filter(
-            LessonProgress.student_id == student_id,
-            LessonProgress.updated_at >= start_datetime
-        )
-        .all()
-    )
-
-    # Initialize daily map
-    daily_map = {start_date + timedelta(days=i): 0 for i in range(7)}
-    learned_words = set()
-    total_minutes = 0
-    lessons_completed = 0
+    return report_service.activity_reports(db, [student_id], start_date, today)[student_id]
 
-    for prog, lesson, video in progress_records:
-        day = prog.updated_at.date()
-        if day < start_date: continue # Should be filtered by DB query, but safe check
-        
-        # Calculate duration in seconds
-        duration = 0
-        if prog.is_completed:
-            lessons_completed += 1
-            if lesson.pronunciation_word:
-                learned_words.add(lesson.pronunciation_word)
-            
-            # Use video duration if avail, else guess 5 mins
-            if video and video.duration_seconds:
-                duration = video.duration_seconds
-            else:
-                duration = 300 # 5 mins default
-        else:
-            # In-progress: use watched position
-            duration = prog.last_watched_position or 0
 
-        minutes = duration // 60
-        if day in daily_map:
-            daily_map[day] += minutes
-        total_minutes += minutes
-
-    # Format chart data
-    daily_chart = [
-        DailyProgress(date=d, minutes=m) 
-        for d, m in daily_map.items()
-    ]
-    # Sort by date
-    daily_chart.sort(key=lambda x: x.date)
+@router.get("/household", response_model=HouseholdReportResponse)
+def get_household_report(
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Weekly learning reports of every child of the current parent.
+    Computed in one set of grouped queries, so the cost doesn't grow with the number of children.
+    """
+    if not current_user.parent_profile:
+        raise HTTPException(status_code=400, detail="User is not a parent")
 
-    # 2. Identify Weak Words (Low Quiz Scores)
-    # Filter: created_at >= start_datetime, score/total < 0.6
-    weak_words_query = (
-        db.query(Lesson.pronunciation_word)
-        .join(QuizResult, QuizResult.lesson_id == Lesson.id)
-        .filter(
-            QuizResult.student_id == student_id,
-            QuizResult.created_at >= start_datetime,
-            Lesson.pronunciation_word.isnot(None)
-        )
-        .all()
-    )
-    
-    # We need to filter based on score ratio in python or complex SQL
-    # Let's fetch results and filter python side for simplicity (assuming volume is low per week)
-    quiz_results = (
-        db.query(QuizResult, Lesson)
-        .join(Lesson, QuizResult.lesson_id == Lesson.id)
-        .filter(
-            QuizResult.student_id == student_id,
-            QuizResult.created_at >= start_datetime
-        )
+    children = (
+        db.query(StudentProfile.id, User.full_name, StudentProfile.avatar_url)
+        .join(User, StudentProfile.user_id == User.id)
+        .filter(StudentProfile.parent_id == current_user.parent_profile.id)
+        .order_by(StudentProfile.id)
         .all()
     )
 
-    weak_words_set = set()
-    for qr, lesson in quiz_results:
-        if qr.total_questions > 0:
-            ratio = qr.score / qr.total_questions
-            if ratio < 0.6 and lesson.pronunciation_word:
-                 weak_words_set.add(lesson.pronunciation_word)
+    today = activity_service.local_today()
+    start_date = today - timedelta(days=6)
+    reports = report_service.activity_reports(db, [child.id for child in children], start_date, today)
 
-    return WeeklyReportResponse(
-        total_minutes=total_minutes,
-        lessons_completed=lessons_completed,
-        learned_words=list(learned_words),
-        weak_words=list(weak_words_set),
-        daily_chart=daily_chart
-    )
+    return HouseholdReportResponse(children=[
+        ChildWeeklyReport(
+            student_id=child.id,
+            full_name=child.full_name,
+            avatar_url=child.avatar_url,
+            report=reports[child.id]
+        )
+        for child in children
+    ])
@@ -1,16 +1,21 @@
 from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.api import deps
+from app.api.etag import make_etag, is_not_modified, not_modified, set_etag
 from app.models.shop import ShopItem, Inventory
 from app.models.user import User, StudentProfile
 from app.schemas import shop as shop_schemas
+from app.services.student_state_service import bump_state_version
 
 router = APIRouter()
 
 @router.get("/items", response_model=List[shop_schemas.ShopItem])
 def read_shop_items(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.get_current_user),
 ) -> Any:
@@ -19,6 +24,14 @@ def read_shop_items(
     if not student:
         raise HTTPException(status_code=404, detail="Student profile not found")
 
+    # Ownership/equipment come with the student's state version; the catalog
+    # (seeded, no admin view) is identified by its size and newest id
+    item_count, last_item_id = db.query(func.count(ShopItem.id), func.max(ShopItem.id)).one()
+    etag = make_etag("shop", student.id, student.state_version, item_count, last_item_id)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
     items = db.query(ShopItem).all()
     
     # Get user inventory to map is_owned and is_equipped
@@ -83,6 +96,7 @@ def buy_item(
         # is_equipped defaults to False
         new_inv = Inventory(student_id=student.id, item_id=item.id)
         db.add(new_inv)
+        bump_state_version(student)
         db.add(student)
         db.commit()
     except Exception as e:
@@ -146,6 +160,7 @@ def equip_item(
         
         target_inv.is_equipped = True
         db.add(target_inv)
+        bump_state_version(student)
         
         db.commit()
         
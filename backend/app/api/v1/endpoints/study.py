@@ -1,11 +1,13 @@
 from typing import List, Any
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from app.api import deps
+from app.api.pagination import page_params, keyset_paginate, NEXT_CURSOR_HEADER
 from app.models.user import User
 from app.schemas import study as schemas
 from app.services import study_service
 from app.models.vocabulary import Vocabulary
+from app.models.srs import UserWordProgress
 
 router = APIRouter()
 
@@ -29,13 +31,22 @@ def submit_word_progress(
 
 @router.get("/review-today", response_model=List[schemas.WordReviewResponse])
 def get_words_to_review(
+    response: Response,
+    page: tuple = Depends(page_params),
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
 ) -> Any:
     """
-    Get words scheduled for review today or overdue.
+    Get words scheduled for review today or overdue, most overdue first.
+    Keyset paginated: the next page's cursor is in the X-Next-Cursor header.
     """
-    progress_list = study_service.get_words_due_for_review(db, current_user.id)
+    cursor, limit = page
+    progress_list, next_cursor = keyset_paginate(
+        study_service.words_due_for_review_query(db, current_user.id),
+        [UserWordProgress.next_review_at, UserWordProgress.id], "review_today", cursor, limit
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     result = []
     for p in progress_list:
         result.append({
@@ -0,0 +1,22 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.schemas.sync import SyncResponse
+from app.services import sync_service
+
+router = APIRouter()
+
+
+@router.get("/", response_model=SyncResponse)
+def sync_curriculum(
+    since: int = Query(0, ge=0, description="`version` of the previous sync, 0 for a full download"),
+    db: Session = Depends(get_db),
+) -> Any:
+    """
+    Curriculum changes since the client's last sync: courses, units, lessons,
+    questions and vocabulary rows to upsert, plus the ids of deleted rows.
+    """
+    return sync_service.changes_since(db, since)
@@ -1,12 +1,17 @@
 from datetime import datetime, date
 from typing import Any, Optional
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.api import deps
+from app.api.etag import make_etag, is_not_modified, not_modified, set_etag
 from app.models.user import User, StudentProfile
-from app.schemas.user import PasswordChange, UserProfileUpdate
+from app.schemas.user import PasswordChange, UserProfileUpdate, PointLogResponse
+from app.schemas.pagination import CursorPage
+from app.api.pagination import page_params, keyset_paginate
+from app.models.gamification import PointLog
 from app.core.security import verify_password, get_password_hash
+from app.services.student_state_service import bump_state_version
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -26,13 +31,20 @@ class UserProfileResponse(BaseModel):
 
 @router.get("/profile", response_model=UserProfileResponse)
 def read_user_profile(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.get_current_user),
 ) -> Any:
     student = db.query(StudentProfile).filter(StudentProfile.user_id == current_user.id).first()
     if not student:
         raise HTTPException(status_code=404, detail="Không tìm thấy thông tin học sinh!")
-    
+
+    etag = make_etag("profile", student.id, student.state_version)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
     return UserProfileResponse(
         id=current_user.id,
         email=current_user.email,
@@ -76,6 +88,7 @@ def update_user_profile(
     if user_in.avatar_url is not None:
         student.avatar_url = user_in.avatar_url
 
+    bump_state_version(student)
     db.add(current_user)
     db.add(student)
     db.commit()
@@ -118,3 +131,26 @@ def change_password(
     db.commit()
     
     return {"message": "Đổi mật khẩu thành công!"}
+
+@router.get("/points", response_model=CursorPage[PointLogResponse])
+def read_point_history(
+    page: tuple = Depends(page_params),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Gems/stars history of the current student, newest first (keyset paginated).
+    """
+    student = db.query(StudentProfile).filter(StudentProfile.user_id == current_user.id).first()
+    if not student:
+        raise HTTPException(status_code=404, detail="Không tìm thấy thông tin học sinh!")
+
+    cursor, limit = page
+    logs, next_cursor = keyset_paginate(
+        db.query(PointLog).filter(PointLog.student_id == student.id),
+        [PointLog.created_at, PointLog.id], "point_logs", cursor, limit, descending=True
+    )
+    return CursorPage[PointLogResponse](
+        items=[PointLogResponse.model_validate(log) for log in logs],
+        next_cursor=next_cursor
+    )
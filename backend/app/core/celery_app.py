@@ -1,4 +1,5 @@
 from celery import Celery
+from celery.schedules import crontab
 from app.core.config import settings
 
 celery_app = Celery(
@@ -11,8 +12,20 @@ celery_app.conf.update(
     task_serializer="json",
     accept_content=["json"],
     result_serializer="json",
-    timezone="Asia/Ho_Chi_Minh",
+    timezone=settings.TIMEZONE,
     enable_utc=True,
     broker_connection_retry_on_startup=True,
+    # Fired by the `beat` service (docker-compose.yml), which must be running:
+    # learning event partitions are only created ahead / dropped past retention here
+    beat_schedule={
+        "maintain-learning-event-partitions": {
+            "task": "app.services.tasks.maintain_learning_event_partitions_task",
+            "schedule": crontab(hour=0, minute=5),
+        },
+        "send-weekly-reports": {
+            "task": "app.services.tasks.send_weekly_reports_task",
+            "schedule": crontab(day_of_week=0, hour=19, minute=0),
+        },
+    },
 )
 
@@ -3,9 +3,14 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.models import Base
 from app.api.v1.api import api_router
-from app.core.database import engine, init_db
+from app.core.database import engine, init_db, SessionLocal
 from sqladmin import Admin
 from app.admin_auth import admin_auth
+from app.services.leaderboard_service import leaderboard_engine
+from app.services.watch_position_service import watch_position_buffer
+from app.services import learning_event_service
+from app.services.learning_event_service import learning_event_writer
+from datetime import datetime, timedelta
 from app.admin_views import UserAdmin, CourseAdmin, UnitAdmin, LessonAdmin, QuestionAdmin, OrderAdmin, CouponAdmin
 
 init_db()
@@ -23,6 +28,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Readable by the frontend (keyset pagination of list endpoints)
+    expose_headers=["X-Next-Cursor"],
 )
 
 @app.get("/")
@@ -31,6 +38,22 @@ def root():
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+@app.on_event("startup")
+def load_leaderboard():
+    db = SessionLocal()
+    try:
+        leaderboard_engine.load(db)
+        # Make sure today's event partitions exist even if the beat job hasn't run yet
+        today = datetime.utcnow().date()
+        learning_event_service.ensure_partitions(db, today - timedelta(days=1), days=3)
+    finally:
+        db.close()
+
+@app.on_event("shutdown")
+def flush_watch_positions():
+    watch_position_buffer.stop()
+    learning_event_writer.stop()
+
 # Admin Interface Integration
 admin = Admin(app, engine, authentication_backend=admin_auth)
 admin.add_view(UserAdmin)
@@ -1,10 +1,10 @@
 from app.core.database import Base
-from .enums import UserRole, CourseLevel, LessonType, ItemType, CurrencyType
+from .enums import UserRole, CourseLevel, LessonType, ItemType, CurrencyType, LearningEventType
 from .user import User, StudentProfile
 from .curriculum import Course, Unit, Lesson, Question, LessonType, CourseLevel
-from .progress import LessonProgress, QuizResult
+from .progress import LessonProgress, QuizResult, LessonQuizSummary
 from .shop import ShopItem, Inventory
-from .gamification import Item, UserItem, PointLog
+from .gamification import Item, UserItem, PointLog, DailyPointTotal
 from .order import Order
 from .coupon import Coupon
 from .chat import ChatHistory
@@ -12,3 +12,9 @@ from .user_course import UserCourse
 from .gem_pack import GemPack
 from .vocabulary import Vocabulary
 from .srs import UserWordProgress
+from .learning_event import LearningEvent
+from .activity import DailyActivity
+from .job_checkpoint import JobCheckpoint
+from .content_version import ContentVersion
+from .unit_bundle import UnitBundle
+from .sync import ContentTombstone
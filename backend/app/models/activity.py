@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, Date, ForeignKey, DateTime
+from sqlalchemy.dialects.postgresql import ARRAY
+from datetime import datetime
+from app.core.database import Base
+
+class DailyActivity(Base):
+    """
+    Per-student rollup of one local (settings.TIMEZONE) day of learning,
+    kept up to date incrementally by the progress and learning event writers.
+    """
+    __tablename__ = 'daily_activities'
+
+    student_id = Column(Integer, ForeignKey('student_profiles.id'), primary_key=True)
+    day = Column(Date, primary_key=True)
+
+    # Time measured from the learning event log
+    study_seconds = Column(Integer, nullable=False, default=0)
+    # Fallback estimate (video duration, else 5 mins) of lessons completed without a logged session
+    estimated_seconds = Column(Integer, nullable=False, default=0)
+    lessons_completed = Column(Integer, nullable=False, default=0)
+    quizzes_taken = Column(Integer, nullable=False, default=0)
+    completed_lesson_ids = Column(ARRAY(Integer), nullable=False, default=list)
+    low_score_lesson_ids = Column(ARRAY(Integer), nullable=False, default=list)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __str__(self):
+        return f"Activity {self.day} (Student: {self.student_id})"
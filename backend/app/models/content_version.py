@@ -0,0 +1,17 @@
+from sqlalchemy import Column, BigInteger, String, DateTime
+from datetime import datetime
+from app.core.database import Base
+
+class ContentVersion(Base):
+    """
+    Counter bumped every time a kind of content changes (e.g. "curriculum"),
+    so per-worker caches know when their snapshot is stale.
+    """
+    __tablename__ = 'content_versions'
+
+    name = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=1)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
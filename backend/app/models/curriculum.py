@@ -2,14 +2,15 @@ from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Text, JSON
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 from .enums import CourseLevel, LessonType
+from .sync import SyncVersionMixin
 
-class Course(Base):
+class Course(SyncVersionMixin, Base):
     __tablename__ = 'courses'
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     description = Column(Text, nullable=True)
-    level = Column(Enum(CourseLevel), nullable=False)
+    level = Column(Enum(CourseLevel), nullable=False, index=True)
     thumbnail_url = Column(String, nullable=True)
 
     units = relationship("Unit", back_populates="course", cascade="all, delete-orphan")
@@ -17,7 +18,7 @@ class Course(Base):
     def __str__(self):
         return self.title
 
-class Unit(Base):
+class Unit(SyncVersionMixin, Base):
     __tablename__ = 'units'
 
     id = Column(Integer, primary_key=True, index=True)
@@ -31,7 +32,7 @@ class Unit(Base):
     def __str__(self):
         return self.title
 
-class Lesson(Base):
+class Lesson(SyncVersionMixin, Base):
     __tablename__ = 'lessons'
 
     id = Column(Integer, primary_key=True, index=True)
@@ -67,7 +68,7 @@ class VideoMaterial(Base):
 
     lesson = relationship("Lesson", back_populates="video_material")
 
-class Question(Base):
+class Question(SyncVersionMixin, Base):
     __tablename__ = 'questions'
 
     id = Column(Integer, primary_key=True, index=True)
@@ -42,3 +42,8 @@ class OrderStatus(enum.Enum):
 class DiscountType(enum.Enum):
     PERCENT = "percent"
     FIXED_AMOUNT = "fixed_amount"
+
+class LearningEventType(enum.Enum):
+    SESSION_START = "session_start"
+    HEARTBEAT = "heartbeat"
+    SESSION_END = "session_end"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Date, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -30,6 +30,10 @@ class UserItem(Base):
 
 class PointLog(Base):
     __tablename__ = 'point_logs'
+    __table_args__ = (
+        # Point history of a student, newest first (keyset pagination)
+        Index('ix_point_logs_student_created', 'student_id', 'created_at', 'id'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(Integer, ForeignKey('student_profiles.id'), nullable=False)
@@ -40,3 +44,21 @@ class PointLog(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
     student = relationship("StudentProfile", back_populates="point_logs")
+
+class DailyPointTotal(Base):
+    """
+    Points earned per student, per UTC day and currency.
+    Maintained incrementally next to PointLog so windowed leaderboards
+    aggregate at most one row per student per day.
+    """
+    __tablename__ = 'daily_point_totals'
+
+    student_id = Column(Integer, ForeignKey('student_profiles.id'), primary_key=True)
+    day = Column(Date, primary_key=True)
+    currency_type = Column(Enum(CurrencyType), primary_key=True)
+
+    amount = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index('ix_daily_point_totals_currency_day', 'currency_type', 'day'),
+    )
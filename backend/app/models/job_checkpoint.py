@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from app.core.database import Base
+
+class JobCheckpoint(Base):
+    """
+    Progress of a long-running batch job, so a restarted run resumes after the
+    last committed chunk instead of starting over. One row per job run
+    (e.g. "weekly_report:2026-10-12").
+    """
+    __tablename__ = 'job_checkpoints'
+
+    name = Column(String, primary_key=True)
+    last_id = Column(Integer, nullable=False, default=0)
+    processed = Column(Integer, nullable=False, default=0)
+    started_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+    def __str__(self):
+        return f"{self.name} (last id {self.last_id})"
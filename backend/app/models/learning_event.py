@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, BigInteger, DateTime, Enum, Index, Sequence
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+from app.core.database import Base
+from .enums import LearningEventType
+
+class LearningEvent(Base):
+    """
+    Append-only log of learning session events (start / heartbeat / end).
+
+    Range-partitioned by UTC day on occurred_at (one `learning_events_YYYYMMDD`
+    partition per day, see learning_event_service), so queries over a date
+    range only touch those days and old days are dropped as whole partitions.
+    No foreign keys, to keep inserts cheap and partitions independent.
+    """
+    __tablename__ = 'learning_events'
+    __table_args__ = (
+        Index('ix_learning_events_student_occurred', 'student_id', 'occurred_at'),
+        {'postgresql_partition_by': 'RANGE (occurred_at)'},
+    )
+
+    id = Column(BigInteger, Sequence('learning_events_id_seq'), primary_key=True)
+    occurred_at = Column(DateTime, primary_key=True, default=datetime.utcnow)
+    student_id = Column(Integer, nullable=False)
+    lesson_id = Column(Integer, nullable=True)
+    session_id = Column(UUID(as_uuid=True), nullable=False)
+    event_type = Column(Enum(LearningEventType), nullable=False)
+    position = Column(Integer, nullable=True) # Video position (seconds), if any
+
+    def __str__(self):
+        return f"{self.event_type} (Student: {self.student_id}, Session: {self.session_id})"
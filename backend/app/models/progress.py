@@ -1,16 +1,21 @@
-from sqlalchemy import Column, Integer, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, Boolean, ForeignKey, DateTime, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
 
 class LessonProgress(Base):
     __tablename__ = 'lesson_progress'
+    __table_args__ = (
+        UniqueConstraint('student_id', 'lesson_id', name='uq_lesson_progress_student_lesson'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(Integer, ForeignKey('student_profiles.id'), nullable=False)
     lesson_id = Column(Integer, ForeignKey('lessons.id'), nullable=False)
     
     is_completed = Column(Boolean, default=False)
+    # Set once, when the lesson is first completed (never overwritten)
+    completed_at = Column(DateTime, nullable=True)
     last_watched_position = Column(Integer, default=0)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -37,3 +42,23 @@ class QuizResult(Base):
 
     def __str__(self):
         return f"Quiz Result {self.id} (Score: {self.score}/{self.total_questions})"
+
+class LessonQuizSummary(Base):
+    """
+    One row per (student, lesson), maintained on every quiz submission so the
+    star award check and the learning path never scan quiz_results.
+    """
+    __tablename__ = 'lesson_quiz_summaries'
+
+    student_id = Column(Integer, ForeignKey('student_profiles.id'), primary_key=True)
+    lesson_id = Column(Integer, ForeignKey('lessons.id'), primary_key=True)
+
+    attempts = Column(Integer, nullable=False, default=0)
+    best_score = Column(Integer, nullable=False, default=0)
+    last_score = Column(Integer, nullable=False, default=0)
+    # Set once, on the first passing attempt (never overwritten)
+    first_passed_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __str__(self):
+        return f"Quiz Summary (Student: {self.student_id}, Lesson: {self.lesson_id}, Best: {self.best_score})"
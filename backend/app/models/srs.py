@@ -1,10 +1,15 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
 
 class UserWordProgress(Base):
     __tablename__ = 'user_word_progress'
+    __table_args__ = (
+        UniqueConstraint('user_id', 'word_id', name='uq_user_word_progress_user_word'),
+        # Words due for review, in review order (keyset pagination)
+        Index('ix_user_word_progress_user_next_review', 'user_id', 'next_review_at', 'id'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
@@ -0,0 +1,47 @@
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime, event, insert, literal_column
+from datetime import datetime
+from app.core.database import Base
+
+# 64-bit id of the writing transaction: increases over time and, unlike a
+# sequence value, tells whether the write can still be in flight (see sync_service)
+CURRENT_XACT_ID = literal_column("pg_current_xact_id()::text::bigint")
+
+
+class SyncVersionMixin:
+    """
+    `row_version` is set to the writing transaction's id on every insert and
+    update, so "changed since N" is `row_version >= N`. Deletes leave a
+    ContentTombstone (see the after_delete listener below).
+    """
+    row_version = Column(
+        BigInteger,
+        nullable=False,
+        index=True,
+        default=CURRENT_XACT_ID,
+        onupdate=CURRENT_XACT_ID,
+        server_default=CURRENT_XACT_ID,
+    )
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class ContentTombstone(Base):
+    """
+    A deleted synced row, e.g. ("lessons", 12), versioned like row_version
+    so clients can drop it from their copy.
+    """
+    __tablename__ = 'content_tombstones'
+
+    id = Column(Integer, primary_key=True, index=True)
+    entity = Column(String, nullable=False)  # table name
+    entity_id = Column(Integer, nullable=False)
+    row_version = Column(BigInteger, nullable=False, index=True, default=CURRENT_XACT_ID)
+    deleted_at = Column(DateTime, default=datetime.utcnow)
+
+    def __str__(self):
+        return f"{self.entity} {self.entity_id} deleted (v{self.row_version})"
+
+
+@event.listens_for(SyncVersionMixin, "after_delete", propagate=True)
+def _record_tombstone(mapper, connection, target):
+    # Same connection, same transaction as the delete itself
+    connection.execute(insert(ContentTombstone).values(entity=target.__tablename__, entity_id=target.id))
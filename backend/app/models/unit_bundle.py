@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey
+from datetime import datetime
+from app.core.database import Base
+
+class UnitBundle(Base):
+    """
+    Offline pack of a unit, stored gzipped in MinIO under its content hash.
+
+    `content_version` is the curriculum version the pack was last checked
+    against: a unit whose content didn't change keeps its hash across versions.
+    """
+    __tablename__ = 'unit_bundles'
+
+    unit_id = Column(Integer, ForeignKey('units.id', ondelete='CASCADE'), primary_key=True)
+    content_version = Column(BigInteger, nullable=False)
+    content_hash = Column(String(64), nullable=False, index=True)
+    size = Column(Integer, nullable=False)  # gzipped bytes
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __str__(self):
+        return f"Unit {self.unit_id} bundle {self.content_hash[:12]}"
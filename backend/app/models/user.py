@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, ForeignKey, DateTime, Enum, LargeBinary
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 from app.core.database import Base
 from .enums import UserRole
@@ -40,12 +40,17 @@ class StudentProfile(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey('users.id'), unique=True, nullable=False)
-    parent_id = Column(Integer, ForeignKey('parent_profiles.id'), nullable=True)
+    parent_id = Column(Integer, ForeignKey('parent_profiles.id'), nullable=True, index=True)
     
     date_of_birth = Column(DateTime, nullable=True)
     avatar_url = Column(String, nullable=True)
     total_gems = Column(Integer, default=0)
     total_stars = Column(Integer, default=0)
+    # Bumped by every write that changes what the student sees (progress, rewards,
+    # purchases, equipment, profile); drives the ETags of the per-student endpoints
+    state_version = Column(BigInteger, nullable=False, default=0, server_default='0')
+    # One bit per lesson id, set on completion (see completion_service); only loaded when accessed
+    completion_bitmap = deferred(Column(LargeBinary, nullable=False, default=b'', server_default=''))
 
     user = relationship("User", back_populates="student_profile")
     parent = relationship("ParentProfile", back_populates="students")
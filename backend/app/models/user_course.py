@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, Boolean, String
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Boolean, String, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -27,5 +27,10 @@ class UserCourse(Base):
     access_expires_at = Column(DateTime, nullable=True)  # Nếu khóa học có hạn
     notes = Column(String, nullable=True)  # Ghi chú (ví dụ: lý do kích hoạt)
 
+    __table_args__ = (
+        # Danh sách học sinh theo khóa học (bảng xếp hạng theo khóa/cấp độ)
+        Index('ix_user_courses_course_active_user', 'course_id', 'is_active', 'user_id'),
+    )
+
     def __str__(self):
         return f"User {self.user_id} - Course {self.course_id}"
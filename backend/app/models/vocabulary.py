@@ -1,8 +1,9 @@
 from sqlalchemy import Column, Integer, String, ForeignKey, Text
 from sqlalchemy.orm import relationship
 from app.core.database import Base
+from .sync import SyncVersionMixin
 
-class Vocabulary(Base):
+class Vocabulary(SyncVersionMixin, Base):
     __tablename__ = 'vocabularies'
 
     id = Column(Integer, primary_key=True, index=True)
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from typing import List
+
+class UnitBundleInfo(BaseModel):
+    unit_id: int
+    hash: str
+    size: int  # gzipped bytes
+    url: str
+
+class CourseBundlesResponse(BaseModel):
+    course_id: int
+    version: int
+    units: List[UnitBundleInfo] = []
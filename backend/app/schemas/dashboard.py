@@ -21,4 +21,12 @@ class UnitDashboardResponse(BaseModel):
     lessons: List[LessonDashboardResponse]
 
 class DashboardPathResponse(BaseModel):
+    course_id: Optional[int] = None
+    # Unit holding the first lesson the student has not completed yet
+    current_unit_id: Optional[int] = None
+    # First lesson of the course not completed yet (None once the course is finished)
+    next_lesson_id: Optional[int] = None
     units: List[UnitDashboardResponse]
+    # Pass as `before` / `after` to load the neighbouring units (None at either end)
+    prev_cursor: Optional[int] = None
+    next_cursor: Optional[int] = None
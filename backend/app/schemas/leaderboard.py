@@ -12,3 +12,4 @@ class LeaderboardEntry(BaseModel):
 class LeaderboardResponse(BaseModel):
     top_users: List[LeaderboardEntry]
     user_rank: Optional[LeaderboardEntry] = None
+    around_user: List[LeaderboardEntry] = []  # Neighbours of the current user (incl. themselves)
@@ -19,6 +19,18 @@ class OrderResponse(BaseModel):
     coupon_code: Optional[str] = None
 
 
+class OrderSummary(BaseModel):
+    order_id: str
+    amount: float
+    discount_amount: float = 0.0
+    description: Optional[str] = None
+    status: str
+    item_type: Optional[str] = None
+    item_id: Optional[str] = None
+    coupon_code: Optional[str] = None
+    created_at: datetime
+
+
 class WebhookPayload(BaseModel):
     # This structure depends on the provider (Casso, Sepay)
     # We will simulate a generic structure or one compatible with typical providers
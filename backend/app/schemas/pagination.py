@@ -0,0 +1,9 @@
+from typing import Generic, List, Optional, TypeVar
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+class CursorPage(BaseModel, Generic[T]):
+    items: List[T]
+    # Opaque; pass back as `cursor` to get the next page (None on the last page)
+    next_cursor: Optional[str] = None
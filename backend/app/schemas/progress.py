@@ -1,5 +1,11 @@
-from pydantic import BaseModel
+from typing import List, Optional
+from uuid import UUID
+from pydantic import BaseModel, Field
 from datetime import datetime
+from app.models.enums import LearningEventType
+
+# Largest value a Postgres integer column holds
+INT4_MAX = 2**31 - 1
 
 class ProgressUpdate(BaseModel):
     lesson_id: int
@@ -12,3 +18,35 @@ class ProgressResponse(BaseModel):
     updated_at: datetime
     earned_gems: int = 0
     earned_stars: int = 0
+
+class ProgressBatchRequest(BaseModel):
+    # Submissions are applied in the order they were made offline
+    items: List[ProgressUpdate] = Field(..., min_length=1, max_length=100)
+
+class ProgressBatchResponse(BaseModel):
+    results: List[ProgressResponse]
+    earned_gems: int = 0
+    earned_stars: int = 0
+
+class WatchHeartbeat(BaseModel):
+    lesson_id: int = Field(..., ge=1, le=INT4_MAX)
+    position: int = Field(..., ge=0, le=INT4_MAX)  # seconds into the video
+    paused: bool = False
+    session_id: Optional[UUID] = None  # also log a heartbeat event for this session
+
+class WatchPositionResponse(BaseModel):
+    lesson_id: int
+    position: int = 0
+
+class LearningEventCreate(BaseModel):
+    session_id: UUID
+    event_type: LearningEventType
+    lesson_id: Optional[int] = Field(None, ge=1, le=INT4_MAX)
+    position: Optional[int] = Field(None, ge=0, le=INT4_MAX)
+    occurred_at: Optional[datetime] = None  # client time (UTC), defaults to now
+
+class LearningEventBatch(BaseModel):
+    events: List[LearningEventCreate] = Field(..., min_length=1, max_length=200)
+
+class LearningEventBatchResponse(BaseModel):
+    accepted: int
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 from datetime import date
 
 class DailyProgress(BaseModel):
@@ -12,3 +12,12 @@ class WeeklyReportResponse(BaseModel):
     learned_words: List[str]
     weak_words: List[str]
     daily_chart: List[DailyProgress]
+
+class ChildWeeklyReport(BaseModel):
+    student_id: int
+    full_name: str
+    avatar_url: Optional[str] = None
+    report: WeeklyReportResponse
+
+class HouseholdReportResponse(BaseModel):
+    children: List[ChildWeeklyReport]
@@ -0,0 +1,47 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from app.schemas.course import CourseBase, UnitBase, LessonBase, QuestionBase
+from app.schemas.study import VocabularyOut
+
+# Rows flattened with their parent id: clients upsert them into their local copy
+
+class SyncCourse(CourseBase):
+    id: int
+
+    class Config:
+        from_attributes = True
+
+class SyncUnit(UnitBase):
+    id: int
+    course_id: int
+
+    class Config:
+        from_attributes = True
+
+class SyncLesson(LessonBase):
+    id: int
+    unit_id: int
+    vocabulary: Optional[List[str]] = None
+
+    class Config:
+        from_attributes = True
+
+class SyncQuestion(QuestionBase):
+    id: int
+    lesson_id: int
+
+    class Config:
+        from_attributes = True
+
+class SyncDeleted(BaseModel):
+    entity: str  # "courses", "units", "lessons", "questions" or "vocabularies"
+    id: int
+
+class SyncResponse(BaseModel):
+    version: int  # send it back as `since` on the next sync
+    courses: List[SyncCourse] = []
+    units: List[SyncUnit] = []
+    lessons: List[SyncLesson] = []
+    questions: List[SyncQuestion] = []
+    vocabularies: List[VocabularyOut] = []
+    deleted: List[SyncDeleted] = []
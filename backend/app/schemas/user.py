@@ -1,5 +1,7 @@
+from datetime import datetime
 from typing import Optional
 from pydantic import BaseModel, EmailStr
+from app.models.enums import CurrencyType
 
 class UserBase(BaseModel):
     email: EmailStr
@@ -29,3 +31,13 @@ class UserProfileUpdate(BaseModel):
     date_of_birth: Optional[str] = None # ISO format string or use date
     avatar_url: Optional[str] = None
 
+
+class PointLogResponse(BaseModel):
+    id: int
+    change_amount: int
+    currency_type: CurrencyType
+    reason: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,78 @@
+from datetime import date, datetime, time, timezone
+from typing import Dict, Iterable, Tuple
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import literal_column
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.activity import DailyActivity
+
+LOCAL_TZ = ZoneInfo(settings.TIMEZONE)
+# Completed lessons without a known video duration count as 5 minutes
+DEFAULT_LESSON_SECONDS = 300
+
+COUNTERS = ("study_seconds", "estimated_seconds", "lessons_completed", "quizzes_taken")
+LISTS = ("completed_lesson_ids", "low_score_lesson_ids")
+
+
+def local_day(utc_dt: datetime) -> date:
+    """
+    Local calendar day of a naive UTC datetime (as stored everywhere in the DB).
+    """
+    return utc_dt.replace(tzinfo=timezone.utc).astimezone(LOCAL_TZ).date()
+
+
+def local_today() -> date:
+    return local_day(datetime.utcnow())
+
+
+def local_day_start(day: date) -> datetime:
+    """
+    Naive UTC datetime at which the local `day` starts.
+    """
+    return datetime.combine(day, time.min, tzinfo=LOCAL_TZ).astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def new_delta(student_id: int, day: date) -> dict:
+    delta = {"student_id": student_id, "day": day}
+    delta.update({name: 0 for name in COUNTERS})
+    delta.update({name: [] for name in LISTS})
+    return delta
+
+
+def record_activity(db: Session, deltas: Iterable[dict]) -> None:
+    """
+    Add activity deltas (see `new_delta`) to the daily rollups in one upsert,
+    inside the caller's transaction. Deltas for the same (student, day) are merged first.
+    """
+    merged: Dict[Tuple[int, date], dict] = {}
+    for delta in deltas:
+        key = (delta["student_id"], delta["day"])
+        if key not in merged:
+            merged[key] = new_delta(*key)
+        for name in COUNTERS:
+            merged[key][name] += delta.get(name, 0)
+        for name in LISTS:
+            merged[key][name].extend(delta.get(name, []))
+    if not merged:
+        return
+
+    rows = [merged[key] for key in sorted(merged)]
+    for row in rows:
+        row["low_score_lesson_ids"] = sorted(set(row["low_score_lesson_ids"]))
+        row["updated_at"] = datetime.utcnow()
+
+    stmt = insert(DailyActivity).values(rows)
+    set_ = {name: getattr(DailyActivity, name) + getattr(stmt.excluded, name) for name in COUNTERS}
+    set_["completed_lesson_ids"] = DailyActivity.completed_lesson_ids.op("||")(stmt.excluded.completed_lesson_ids)
+    set_["low_score_lesson_ids"] = literal_column(
+        "ARRAY(SELECT DISTINCT unnest(daily_activities.low_score_lesson_ids || excluded.low_score_lesson_ids))"
+    )
+    set_["updated_at"] = stmt.excluded.updated_at
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[DailyActivity.student_id, DailyActivity.day],
+        set_=set_
+    ))
+
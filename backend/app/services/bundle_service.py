@@ -0,0 +1,163 @@
+import gzip
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.unit_bundle import UnitBundle
+from app.models.vocabulary import Vocabulary
+from app.schemas import course as course_schemas
+from app.schemas.study import VocabularyOut
+from app.services.curriculum_service import CurriculumSnapshot
+from app.services.storage import minio_handler
+
+logger = logging.getLogger(__name__)
+
+# Bumped when the bundle layout changes, so every unit gets a new hash
+BUNDLE_FORMAT = 1
+BUNDLE_PREFIX = "bundles/units"
+
+
+def bundle_object_name(content_hash: str) -> str:
+    return f"{BUNDLE_PREFIX}/{content_hash}.json.gz"
+
+
+def _media_urls(unit: course_schemas.Unit, vocabulary: Iterable[VocabularyOut]) -> List[str]:
+    urls = []
+    for lesson in unit.lessons:
+        urls.extend([lesson.thumbnail_url, lesson.video_url, lesson.attachment_url])
+    for word in vocabulary:
+        urls.extend([word.image_url, word.audio_url])
+    # Unique, in first-use order
+    return list(dict.fromkeys(url for url in urls if url))
+
+
+def _media_entry(url: str) -> dict:
+    """
+    Manifest entry of a media file. Size and hash are known for files stored in
+    our bucket (the hash is the MinIO ETag, the MD5 of single-part uploads);
+    external URLs are listed without them. `upload_file` names every upload
+    after a new uuid, so a replaced file always comes with a new URL on its
+    lesson or word, whose save bumps the curriculum version.
+    """
+    object_name = minio_handler.object_name_from_url(url)
+    stat = minio_handler.stat(object_name) if object_name else None
+    size, etag = stat if stat else (None, None)
+    return {"url": url, "size": size, "hash": etag}
+
+
+def build_unit_bundle(
+    unit: course_schemas.Unit,
+    lesson_words: Dict[int, List[str]],
+    vocabulary_by_word: Dict[str, VocabularyOut],
+) -> bytes:
+    """
+    Canonical JSON of a unit's offline pack: lessons with their questions (as
+    served by GET /lessons/{id}), the vocabulary rows their word lists
+    reference, and a manifest of the media they use.
+
+    Keys are sorted and media listed in a stable order, so the same content
+    always gives the same bytes (and hash).
+    """
+    words = dict.fromkeys(
+        word for lesson in unit.lessons for word in lesson_words.get(lesson.id, [])
+    )
+    vocabulary = [vocabulary_by_word[word] for word in words if word in vocabulary_by_word]
+    payload = {
+        "format": BUNDLE_FORMAT,
+        "unit": unit.model_dump(mode="json", exclude={"lessons"}),
+        "lessons": [
+            {**lesson.model_dump(mode="json"), "vocabulary": lesson_words.get(lesson.id, [])}
+            for lesson in unit.lessons
+        ],
+        "vocabulary": [word.model_dump(mode="json") for word in vocabulary],
+        "media": [_media_entry(url) for url in _media_urls(unit, vocabulary)],
+    }
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _store(content_hash: str, data: bytes) -> int:
+    """
+    Upload the gzipped bundle unless an identical one is already stored. Returns its size.
+    """
+    object_name = bundle_object_name(content_hash)
+    stat = minio_handler.stat(object_name)
+    if stat:
+        return stat[0]
+    # mtime=0: same content, same gzip bytes
+    compressed = gzip.compress(data, mtime=0)
+    minio_handler.put_bytes(object_name, compressed, "application/gzip")
+    return len(compressed)
+
+
+def _refresh(db: Session, snapshot: CurriculumSnapshot, units: List[course_schemas.Unit]) -> Dict[int, UnitBundle]:
+    """
+    Rebuild the bundles of `units` against the snapshot's version, in two
+    queries (vocabulary, upsert) whatever the number of units. Word lists come
+    from the snapshot, so lessons and their words are always of one version.
+    Only bundles whose content actually changed are uploaded again.
+    """
+    lesson_words = {
+        lesson.id: list(snapshot.lesson_words.get(lesson.id, ()))
+        for unit in units for lesson in unit.lessons
+    }
+    all_words = {word for words in lesson_words.values() for word in words}
+    vocabulary_by_word = {
+        row.word: VocabularyOut.model_validate(row)
+        for row in db.query(Vocabulary).filter(Vocabulary.word.in_(all_words)).all()
+    } if all_words else {}
+
+    rows = []
+    for unit in units:
+        data = build_unit_bundle(unit, lesson_words, vocabulary_by_word)
+        content_hash = hashlib.sha256(data).hexdigest()
+        rows.append({
+            "unit_id": unit.id,
+            "content_version": snapshot.version,
+            "content_hash": content_hash,
+            "size": _store(content_hash, data),
+            "updated_at": datetime.utcnow(),
+        })
+
+    stmt = insert(UnitBundle).values(rows)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[UnitBundle.unit_id],
+        set_={column: stmt.excluded[column] for column in ("content_version", "content_hash", "size", "updated_at")},
+        # A worker still on an older snapshot never overwrites a newer bundle
+        where=UnitBundle.content_version <= stmt.excluded.content_version
+    ))
+    db.commit()
+    logger.info(f"Unit bundles refreshed for curriculum v{snapshot.version}: {[row['unit_id'] for row in rows]}")
+    return {row["unit_id"]: UnitBundle(**row) for row in rows}
+
+
+def course_bundles(db: Session, snapshot: CurriculumSnapshot, course: course_schemas.Course) -> List[UnitBundle]:
+    """
+    Bundle of every unit of `course`, in path order, as of the snapshot's version.
+
+    Bundles are built at most once per curriculum version: the first request
+    after an admin change (curriculum or vocabulary) rebuilds the stale ones,
+    later ones read the table.
+    """
+    bundles = {
+        bundle.unit_id: bundle
+        for bundle in db.query(UnitBundle).filter(UnitBundle.unit_id.in_([unit.id for unit in course.units])).all()
+    } if course.units else {}
+    stale = [
+        unit for unit in course.units
+        if unit.id not in bundles or bundles[unit.id].content_version < snapshot.version
+    ]
+    if stale:
+        bundles.update(_refresh(db, snapshot, stale))
+    return [bundles[unit.id] for unit in course.units]
+
+
+def get_bundle(content_hash: str) -> Optional[bytes]:
+    """
+    Gzipped bundle stored under `content_hash`, None if unknown.
+    """
+    return minio_handler.get_bytes(bundle_object_name(content_hash))
@@ -0,0 +1,56 @@
+from typing import Iterable, Optional, Sequence
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from app.models.user import StudentProfile
+
+# Completed lessons of a student are kept as a bitmap in
+# StudentProfile.completion_bitmap: bit n (byte n // 8, mask 1 << n % 8, the
+# layout of Postgres get_bit/set_bit) is set once lesson id n is completed.
+# Lesson ids are used as ordinals because they never change, unlike the
+# position of a lesson on the path.
+
+
+def mark_lessons_completed(db: Session, student_id: int, lesson_ids: Iterable[int]) -> None:
+    """
+    Set the bits of `lesson_ids` in one UPDATE, inside the caller's transaction.
+    The bitmap is zero-padded first when it is too short for the highest id.
+    """
+    lesson_ids = sorted(set(lesson_ids))
+    if not lesson_ids:
+        return
+    needed = lesson_ids[-1] // 8 + 1
+    bitmap = StudentProfile.completion_bitmap
+    padded = bitmap.op("||")(func.decode(
+        func.repeat("00", func.greatest(needed - func.length(bitmap), 0)), "hex"
+    ))
+    for lesson_id in lesson_ids:
+        padded = func.set_bit(padded, lesson_id, 1)
+    db.execute(
+        update(StudentProfile)
+        .where(StudentProfile.id == student_id)
+        .values(completion_bitmap=padded)
+    )
+
+
+def to_mask(bitmap: Optional[bytes]) -> int:
+    """
+    The bitmap as an int: lesson n is completed iff `mask >> n & 1`.
+    """
+    return int.from_bytes(bitmap or b"", "little")
+
+
+def is_completed(mask: int, lesson_id: int) -> bool:
+    return bool(mask >> lesson_id & 1)
+
+
+def first_incomplete(mask: int, lesson_ids: Sequence[int]) -> Optional[int]:
+    """
+    Index in `lesson_ids` (a lock chain) of the first lesson not completed yet,
+    i.e. the next unlocked lesson; None when the whole chain is completed.
+    """
+    for index, lesson_id in enumerate(lesson_ids):
+        if not mask >> lesson_id & 1:
+            return index
+    return None
@@ -0,0 +1,250 @@
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Set, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.database import SessionLocal
+from app.models.content_version import ContentVersion
+from app.models.curriculum import Course, Unit, Lesson
+from app.models.vocabulary import Vocabulary
+from app.schemas import course as course_schemas
+
+logger = logging.getLogger(__name__)
+
+CURRICULUM = "curriculum"
+
+
+def get_content_version(db: Session, name: str = CURRICULUM) -> int:
+    version = db.execute(select(ContentVersion.version).where(ContentVersion.name == name)).scalar()
+    return version or 0
+
+
+def _bump_statement(name: str):
+    stmt = insert(ContentVersion).values(name=name, version=1, updated_at=datetime.utcnow())
+    return stmt.on_conflict_do_update(
+        index_elements=[ContentVersion.name],
+        set_={"version": ContentVersion.version + 1, "updated_at": stmt.excluded.updated_at}
+    )
+
+
+def bump_content_version(db: Session, name: str = CURRICULUM) -> None:
+    """
+    Mark the content as changed, inside the caller's transaction.
+    """
+    db.execute(_bump_statement(name))
+
+
+@event.listens_for(Vocabulary, "after_insert")
+@event.listens_for(Vocabulary, "after_update")
+@event.listens_for(Vocabulary, "after_delete")
+def _vocabulary_changed(mapper, connection, target):
+    # Words have no admin view of their own and are written from several places
+    # (API, seed); offline bundles embed them, so any write is a curriculum change.
+    connection.execute(_bump_statement(CURRICULUM))
+
+
+def notify_curriculum_changed() -> None:
+    """
+    Bump the curriculum version from outside a request session (admin views).
+    """
+    db = SessionLocal()
+    try:
+        bump_content_version(db)
+        db.commit()
+    finally:
+        db.close()
+
+
+class CurriculumSnapshot:
+    """
+    Read-only view of the whole course -> unit -> lesson -> question tree.
+
+    Units and lessons are in learning path order (order_index, then id).
+    `course_lesson_ids` is the lock chain of each course and `lesson_ordinals`
+    the position of each lesson on its course's chain; `lesson_words` the
+    word list (Lesson.vocabulary) of each lesson. Never mutate a
+    snapshot: it is shared by every request of the worker.
+    """
+
+    def __init__(
+        self,
+        version: int,
+        courses: Tuple[course_schemas.Course, ...],
+        lesson_words: Optional[Dict[int, Tuple[str, ...]]] = None,
+    ):
+        self.version = version
+        self.courses = courses
+        self.lesson_words: Dict[int, Tuple[str, ...]] = lesson_words or {}
+        self.course_by_id: Dict[int, course_schemas.Course] = {course.id: course for course in courses}
+        # Sorted, as `courses`: keyset lookups by bisection
+        self.course_ids: Tuple[int, ...] = tuple(course.id for course in courses)
+        self.lesson_by_id: Dict[int, course_schemas.Lesson] = {
+            lesson.id: lesson for course in courses for unit in course.units for lesson in unit.lessons
+        }
+        self.course_lesson_ids: Dict[int, Tuple[int, ...]] = {
+            course.id: tuple(lesson.id for unit in course.units for lesson in unit.lessons)
+            for course in courses
+        }
+        self.lesson_ordinals: Dict[int, int] = {
+            lesson_id: ordinal
+            for lesson_ids in self.course_lesson_ids.values()
+            for ordinal, lesson_id in enumerate(lesson_ids)
+        }
+
+
+def _path_order(rows):
+    return sorted(rows, key=lambda row: (row.order_index, row.id))
+
+
+def build_snapshot(db: Session, version: int) -> CurriculumSnapshot:
+    """
+    Load the whole tree with a selectinload chain: one statement per level
+    (courses, units, lessons, questions) whatever the catalog size.
+    """
+    courses = (
+        db.query(Course)
+        .options(selectinload(Course.units).selectinload(Unit.lessons).selectinload(Lesson.questions))
+        .order_by(Course.id)
+        .all()
+    )
+    snapshot_courses = tuple(
+        course_schemas.Course(
+            id=course.id,
+            title=course.title,
+            description=course.description,
+            level=course.level,
+            thumbnail_url=course.thumbnail_url,
+            units=[
+                course_schemas.Unit(
+                    id=unit.id,
+                    title=unit.title,
+                    order_index=unit.order_index,
+                    lessons=[
+                        course_schemas.Lesson(
+                            id=lesson.id,
+                            unit_id=lesson.unit_id,
+                            title=lesson.title,
+                            lesson_type=lesson.lesson_type,
+                            order_index=lesson.order_index,
+                            thumbnail_url=lesson.thumbnail_url,
+                            video_url=lesson.video_url,
+                            attachment_url=lesson.attachment_url,
+                            pronunciation_word=lesson.pronunciation_word,
+                            questions=[
+                                course_schemas.Question.model_validate(question)
+                                for question in _path_order(lesson.questions)
+                            ]
+                        )
+                        for lesson in _path_order(unit.lessons)
+                    ]
+                )
+                for unit in _path_order(course.units)
+            ]
+        )
+        for course in courses
+    )
+    lesson_words = {
+        lesson.id: tuple(lesson.vocabulary or ())
+        for course in courses for unit in course.units for lesson in unit.lessons
+    }
+    return CurriculumSnapshot(version, snapshot_courses, lesson_words)
+
+
+COURSE_FIELDS = frozenset(course_schemas.Course.model_fields) - {"units"}
+UNIT_FIELDS = frozenset(course_schemas.Unit.model_fields) - {"lessons"}
+LESSON_FIELDS = frozenset(course_schemas.Lesson.model_fields) - {"questions"}
+# 0: courses only, 1: + units, 2: + lessons, 3: + questions (full tree)
+MAX_DEPTH = 3
+
+
+def tree_include(fields: Optional[Set[str]] = None, depth: int = MAX_DEPTH) -> dict:
+    """
+    `model_dump(include=...)` spec of a course trimmed to `fields` (course
+    level, all when None) and `depth` levels of children.
+    """
+    include = {name: True for name in (fields or COURSE_FIELDS)}
+    if depth >= 1:
+        unit = {name: True for name in UNIT_FIELDS}
+        if depth >= 2:
+            lesson = {name: True for name in LESSON_FIELDS}
+            if depth >= 3:
+                lesson["questions"] = True
+            unit["lessons"] = {"__all__": lesson}
+        include["units"] = {"__all__": unit}
+    return include
+
+
+class CurriculumCache:
+    """
+    Per-worker curriculum snapshot, rebuilt when the content version changes.
+
+    Each `get` costs one primary-key read of content_versions; the tree itself
+    is only reloaded after an admin change bumps the version.
+    """
+
+    def __init__(self):
+        self._snapshot: Optional[CurriculumSnapshot] = None
+        self._lock = threading.Lock()
+
+    def get(self, db: Session) -> CurriculumSnapshot:
+        # Read the version first: content committed with (or before) the bump is then
+        # always visible to the rebuild below
+        version = get_content_version(db)
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.version != version:
+                snapshot = build_snapshot(db, version)
+                self._snapshot = snapshot
+                logger.info(f"Curriculum snapshot v{version} loaded ({len(snapshot.lesson_ordinals)} lessons)")
+        return snapshot
+
+    def invalidate(self) -> None:
+        self._snapshot = None
+
+
+class LessonPayloadCache:
+    """
+    LRU of fully encoded `GET /lessons/{id}` bodies, per worker.
+
+    Entries are keyed by (lesson id, curriculum version): an admin save bumps
+    the version, so stale payloads are never served and simply age out.
+    """
+
+    def __init__(self, max_entries: int = 2000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[int, int], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, snapshot: CurriculumSnapshot, lesson_id: int) -> Optional[bytes]:
+        """
+        Encoded lesson (with its questions) from `snapshot`, or None if it doesn't exist.
+        """
+        key = (lesson_id, snapshot.version)
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                return payload
+
+        lesson = snapshot.lesson_by_id.get(lesson_id)
+        if lesson is None:
+            return None
+        payload = lesson.model_dump_json().encode()
+        with self._lock:
+            self._entries[key] = payload
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return payload
+
+
+# Global instances, one per worker process
+curriculum_cache = CurriculumCache()
+lesson_payload_cache = LessonPayloadCache()
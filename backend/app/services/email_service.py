@@ -1,7 +1,7 @@
 from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
 from app.core.config import settings
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 class EmailService:
     def __init__(self):
@@ -52,4 +52,21 @@ class EmailService:
         )
         await self.fm.send_message(message, template_name="payment_success.html")
 
+    async def send_weekly_report_email(self, email_to: str, full_name: str, week_start: str, week_end: str, children: List[Dict[str, Any]]):
+        template_body = {
+            "full_name": full_name,
+            "week_start": week_start,
+            "week_end": week_end,
+            "children": children,
+            "project_url": "http://localhost:3000"
+        }
+
+        message = MessageSchema(
+            subject=f"Báo cáo học tập tuần {week_start} - {week_end}",
+            recipients=[email_to],
+            template_body=template_body,
+            subtype=MessageType.html
+        )
+        await self.fm.send_message(message, template_name="weekly_report.html")
+
 email_service = EmailService()
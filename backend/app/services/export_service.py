@@ -0,0 +1,176 @@
+import csv
+import io
+from datetime import date, timedelta
+from typing import Iterator, List, Optional, Sequence
+
+from sqlalchemy import Select, select
+from sqlalchemy.orm import aliased
+
+from app.core.database import SessionLocal
+from app.models.curriculum import Course, Unit, Lesson
+from app.models.enums import OrderStatus
+from app.models.order import Order
+from app.models.progress import LessonProgress, QuizResult
+from app.models.user import User, StudentProfile
+from app.services import activity_service
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = 2000
+# CSV lines written to the response per chunk
+CSV_LINES_PER_CHUNK = 500
+
+QUIZ_RESULT_COLUMNS = [
+    "id", "created_at", "student_id", "email", "full_name", "course_id", "course",
+    "lesson_id", "lesson", "score", "total_questions", "passed",
+]
+LESSON_PROGRESS_COLUMNS = [
+    "id", "updated_at", "completed_at", "student_id", "email", "full_name", "course_id", "course",
+    "lesson_id", "lesson", "is_completed", "last_watched_position",
+]
+ORDER_COLUMNS = [
+    "id", "order_id", "created_at", "user_id", "email", "full_name", "amount", "discount_amount",
+    "coupon_code", "status", "item_type", "item_id", "description",
+]
+
+
+def _date_range(column, start_date: Optional[date], end_date: Optional[date]) -> List:
+    """
+    Filters on a naive UTC datetime column for local days start_date..end_date (inclusive).
+    """
+    conditions = []
+    if start_date:
+        conditions.append(column >= activity_service.local_day_start(start_date))
+    if end_date:
+        conditions.append(column < activity_service.local_day_start(end_date + timedelta(days=1)))
+    return conditions
+
+
+def quiz_results_query(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    course_id: Optional[int] = None,
+    passed: Optional[bool] = None,
+) -> Select:
+    stmt = (
+        select(
+            QuizResult.id, QuizResult.created_at, QuizResult.student_id, User.email, User.full_name,
+            Course.id, Course.title, QuizResult.lesson_id, Lesson.title,
+            QuizResult.score, QuizResult.total_questions, QuizResult.passed,
+        )
+        .join(StudentProfile, QuizResult.student_id == StudentProfile.id)
+        .join(User, StudentProfile.user_id == User.id)
+        .join(Lesson, QuizResult.lesson_id == Lesson.id)
+        .join(Unit, Lesson.unit_id == Unit.id)
+        .join(Course, Unit.course_id == Course.id)
+        .where(*_date_range(QuizResult.created_at, start_date, end_date))
+        .order_by(QuizResult.id)
+    )
+    if course_id is not None:
+        stmt = stmt.where(Course.id == course_id)
+    if passed is not None:
+        stmt = stmt.where(QuizResult.passed.is_(passed))
+    return stmt
+
+
+def lesson_progress_query(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    course_id: Optional[int] = None,
+    is_completed: Optional[bool] = None,
+) -> Select:
+    stmt = (
+        select(
+            LessonProgress.id, LessonProgress.updated_at, LessonProgress.completed_at,
+            LessonProgress.student_id, User.email, User.full_name, Course.id, Course.title,
+            LessonProgress.lesson_id, Lesson.title, LessonProgress.is_completed,
+            LessonProgress.last_watched_position,
+        )
+        .join(StudentProfile, LessonProgress.student_id == StudentProfile.id)
+        .join(User, StudentProfile.user_id == User.id)
+        .join(Lesson, LessonProgress.lesson_id == Lesson.id)
+        .join(Unit, Lesson.unit_id == Unit.id)
+        .join(Course, Unit.course_id == Course.id)
+        .where(*_date_range(LessonProgress.updated_at, start_date, end_date))
+        .order_by(LessonProgress.id)
+    )
+    if course_id is not None:
+        stmt = stmt.where(Course.id == course_id)
+    if is_completed is not None:
+        stmt = stmt.where(LessonProgress.is_completed.is_(is_completed))
+    return stmt
+
+
+def orders_query(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    course_id: Optional[int] = None,
+    status: Optional[OrderStatus] = None,
+) -> Select:
+    buyer = aliased(User)
+    stmt = (
+        select(
+            Order.id, Order.order_id, Order.created_at, Order.user_id, buyer.email, buyer.full_name,
+            Order.amount, Order.discount_amount, Order.coupon_code, Order.status,
+            Order.item_type, Order.item_id, Order.description,
+        )
+        .join(buyer, Order.user_id == buyer.id)
+        .where(*_date_range(Order.created_at, start_date, end_date))
+        .order_by(Order.id)
+    )
+    if course_id is not None:
+        # Course purchases store the course id as item_id (see payment webhook)
+        stmt = stmt.where(Order.item_type == "course", Order.item_id == str(course_id))
+    if status is not None:
+        stmt = stmt.where(Order.status == status)
+    return stmt
+
+
+# Leading characters that make Excel read a cell as a formula
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if hasattr(value, "value"):  # Enum
+        value = value.value
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        # Names, emails and descriptions are user input: keep them as text
+        return "'" + value
+    return value
+
+
+def stream_csv(stmt: Select, columns: Sequence[str]) -> Iterator[bytes]:
+    """
+    Run `stmt` on a server-side cursor and yield the result as CSV chunks.
+
+    The header goes out before the query runs, so the download starts at once;
+    rows are then fetched EXPORT_BATCH_SIZE at a time and written
+    CSV_LINES_PER_CHUNK at a time, so memory stays flat whatever the row count.
+    The generator owns its session: request-scoped ones are closed before a
+    streaming body is sent.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def drain() -> bytes:
+        data = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate(0)
+        return data
+
+    # BOM so Excel opens Vietnamese names correctly
+    buffer.write("﻿")
+    writer.writerow(columns)
+    yield drain()
+
+    db = SessionLocal()
+    try:
+        result = db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        for partition in result.partitions(CSV_LINES_PER_CHUNK):
+            writer.writerows([_csv_value(value) for value in row] for row in partition)
+            yield drain()
+    finally:
+        db.close()
@@ -0,0 +1,178 @@
+import asyncio
+import json
+import logging
+import threading
+from typing import AsyncGenerator, Dict, Iterable, List, Optional, Set, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.database import SessionLocal
+from app.models.user import User, StudentProfile
+from app.schemas.leaderboard import LeaderboardEntry
+from app.services.leaderboard_service import ScopeKey, leaderboard_registry
+
+logger = logging.getLogger(__name__)
+
+
+class _Subscriber:
+    def __init__(self, scope: ScopeKey, student_id: int, full_name: str, avatar_url: Optional[str]):
+        self.scope = scope
+        self.student_id = student_id
+        self.full_name = full_name
+        self.avatar_url = avatar_url
+        # Latest computed state and the state the client has already received
+        self.pending: Optional[dict] = None
+        self.sent: dict = {}
+        self.wakeup = asyncio.Event()
+
+
+class LeaderboardBroadcaster:
+    """
+    Pushes all-time leaderboard changes to Server-Sent Events subscribers.
+
+    Star awards only mark their scopes dirty. A single ticker wakes up every
+    `interval` seconds, ranks each dirty scope once (top N from the in-memory
+    engine) and hands every subscriber of that scope the new state. Each
+    stream then sends only the parts that differ from what its client last
+    received, so a subscriber gets at most one frame per tick no matter how
+    many stars were awarded in between.
+    """
+
+    max_cached_names = 10000
+
+    def __init__(self, interval: float = 1.0, top_limit: int = 10, keepalive: float = 15.0):
+        self.interval = interval
+        self.top_limit = top_limit
+        self.keepalive = keepalive
+        self._subscribers: Dict[ScopeKey, Set[_Subscriber]] = {}
+        self._dirty: Set[ScopeKey] = set()
+        self._dirty_lock = threading.Lock()
+        self._names: Dict[int, Tuple[str, Optional[str]]] = {}
+        self._ticker: Optional[asyncio.Task] = None
+
+    def publish(self, scopes: Iterable[ScopeKey]) -> None:
+        """
+        Mark scopes as changed. Safe to call from sync endpoints running in the threadpool.
+        """
+        with self._dirty_lock:
+            self._dirty.update(scopes)
+
+    async def stream(
+        self, scope: ScopeKey, student_id: int, full_name: str, avatar_url: Optional[str]
+    ) -> AsyncGenerator[str, None]:
+        subscriber = _Subscriber(scope, student_id, full_name, avatar_url)
+        self._subscribers.setdefault(scope, set()).add(subscriber)
+        self._ensure_ticker()
+        try:
+            # Initial snapshot
+            await self._refresh_scope(scope, [subscriber])
+            while True:
+                try:
+                    await asyncio.wait_for(subscriber.wakeup.wait(), timeout=self.keepalive)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                subscriber.wakeup.clear()
+
+                frame = self._diff(subscriber)
+                if frame:
+                    yield f"event: leaderboard\ndata: {json.dumps(frame, ensure_ascii=False)}\n\n"
+        finally:
+            members = self._subscribers.get(scope)
+            if members is not None:
+                members.discard(subscriber)
+                if not members:
+                    del self._subscribers[scope]
+
+    def _ensure_ticker(self) -> None:
+        if self._ticker is None or self._ticker.done():
+            self._ticker = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        while self._subscribers:
+            await asyncio.sleep(self.interval)
+            with self._dirty_lock:
+                dirty, self._dirty = self._dirty, set()
+            for scope in dirty:
+                members = self._subscribers.get(scope)
+                if not members:
+                    continue
+                try:
+                    await self._refresh_scope(scope, list(members))
+                except Exception as e:
+                    logger.error(f"Failed to refresh leaderboard stream {scope}: {e}")
+
+    async def _refresh_scope(self, scope: ScopeKey, members: List[_Subscriber]) -> None:
+        engine = await run_in_threadpool(self._get_engine, scope)
+        top_ranked = engine.top(self.top_limit)
+        await self._load_names([s_id for _, s_id, _ in top_ranked])
+
+        top_state = [(rank, s_id, stars) for rank, s_id, stars in top_ranked if s_id in self._names]
+        for subscriber in members:
+            subscriber.pending = {
+                "top_users": top_state,
+                "user_rank": (engine.rank(subscriber.student_id), engine.stars(subscriber.student_id)),
+            }
+            subscriber.wakeup.set()
+
+    def _diff(self, subscriber: _Subscriber) -> dict:
+        frame = {}
+        state = subscriber.pending or {}
+        if state.get("top_users") != subscriber.sent.get("top_users"):
+            frame["top_users"] = [
+                self._entry(subscriber, rank, s_id, stars).model_dump()
+                for rank, s_id, stars in state["top_users"]
+            ]
+        if state.get("user_rank") != subscriber.sent.get("user_rank"):
+            rank, stars = state["user_rank"]
+            if rank is not None:
+                frame["user_rank"] = self._entry(subscriber, rank, subscriber.student_id, stars).model_dump()
+        subscriber.sent = state
+        return frame
+
+    def _entry(self, subscriber: _Subscriber, rank: int, student_id: int, stars: int) -> LeaderboardEntry:
+        if student_id == subscriber.student_id:
+            full_name, avatar_url = subscriber.full_name, subscriber.avatar_url
+        else:
+            full_name, avatar_url = self._names.get(student_id, ("", None))
+        return LeaderboardEntry(
+            rank=rank,
+            student_id=student_id,
+            full_name=full_name,
+            avatar_url=avatar_url,
+            stars=stars or 0,
+            is_current_user=(student_id == subscriber.student_id)
+        )
+
+    async def _load_names(self, student_ids: List[int]) -> None:
+        missing = [s_id for s_id in student_ids if s_id not in self._names]
+        if missing:
+            if len(self._names) > self.max_cached_names:
+                self._names.clear()
+            self._names.update(await run_in_threadpool(self._query_names, missing))
+
+    @staticmethod
+    def _get_engine(scope: ScopeKey):
+        db = SessionLocal()
+        try:
+            return leaderboard_registry.get(db, scope)
+        finally:
+            db.close()
+
+    @staticmethod
+    def _query_names(student_ids: List[int]) -> Dict[int, Tuple[str, Optional[str]]]:
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(StudentProfile.id, User.full_name, StudentProfile.avatar_url)
+                .join(User, StudentProfile.user_id == User.id)
+                .filter(StudentProfile.id.in_(student_ids))
+                .all()
+            )
+            return {s_id: (full_name, avatar_url) for s_id, full_name, avatar_url in rows}
+        finally:
+            db.close()
+
+
+# Global instance, one ticker per worker process
+leaderboard_broadcaster = LeaderboardBroadcaster()
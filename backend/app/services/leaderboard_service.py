@@ -0,0 +1,331 @@
+import bisect
+import logging
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, literal, or_, select, union_all
+from sqlalchemy.orm import Session
+
+from app.models.curriculum import Course
+from app.models.enums import CurrencyType
+from app.models.gamification import DailyPointTotal
+from app.models.user import StudentProfile, User
+from app.models.user_course import UserCourse
+
+logger = logging.getLogger(__name__)
+
+# Scope keys are (kind, value): ("global", None), ("level", CourseLevel),
+# ("course", course_id) or ("household", parent_profile_id)
+ScopeKey = Tuple[str, Any]
+GLOBAL_SCOPE: ScopeKey = ("global", None)
+
+
+def scope_student_ids(scope: ScopeKey):
+    """
+    SELECT of the student ids that belong to a scope, or None for the global scope.
+    Each variant is served by an index (user_courses course/user, courses level,
+    student_profiles parent_id).
+    """
+    kind, value = scope
+    if kind == "global":
+        return None
+    if kind == "household":
+        return select(StudentProfile.id).where(StudentProfile.parent_id == value)
+
+    holders = (
+        select(StudentProfile.id)
+        .join(UserCourse, UserCourse.user_id == StudentProfile.user_id)
+        .where(UserCourse.is_active == True)
+    )
+    if kind == "course":
+        return holders.where(UserCourse.course_id == value)
+    if kind == "level":
+        return holders.join(Course, Course.id == UserCourse.course_id).where(Course.level == value)
+    raise ValueError(f"Unknown leaderboard scope: {kind}")
+
+
+class RankedLeaderboard:
+    """
+    Per-process ranking of students by total stars.
+
+    Students are kept in a sorted list of (-stars, student_id) keys so the
+    best students come first. "Top N" is a slice of the head of the list and
+    "my rank" is a bisect, so neither touches the database. Ties share a
+    rank, exactly like `COUNT(*) WHERE total_stars > x` + 1.
+    """
+
+    def __init__(self, scope: ScopeKey = GLOBAL_SCOPE):
+        self.scope = scope
+        self._keys: List[Tuple[int, int]] = []
+        self._stars: Dict[int, int] = {}
+        self._lock = threading.RLock()
+        self.is_loaded = False
+
+    def _scoped_query(self, db: Session):
+        query = db.query(StudentProfile.id, StudentProfile.total_stars)
+        member_ids = scope_student_ids(self.scope)
+        if member_ids is not None:
+            query = query.filter(StudentProfile.id.in_(member_ids))
+        return query
+
+    def load(self, db: Session) -> None:
+        """
+        (Re)build the ranking from StudentProfile.total_stars of the students in scope.
+        """
+        rows = self._scoped_query(db).all()
+        stars = {student_id: total or 0 for student_id, total in rows}
+        keys = sorted((-total, student_id) for student_id, total in stars.items())
+
+        with self._lock:
+            self._stars = stars
+            self._keys = keys
+            self.is_loaded = True
+
+        logger.info(f"Leaderboard {self.scope} loaded with {len(keys)} students")
+
+    def ensure_loaded(self, db: Session) -> None:
+        if not self.is_loaded:
+            self.load(db)
+
+    def update(self, student_id: int, stars: int) -> None:
+        """
+        Insert or move a student after their total stars changed.
+        """
+        stars = stars or 0
+        with self._lock:
+            old_stars = self._stars.get(student_id)
+            if old_stars == stars:
+                return
+            if old_stars is not None:
+                idx = bisect.bisect_left(self._keys, (-old_stars, student_id))
+                if idx < len(self._keys) and self._keys[idx] == (-old_stars, student_id):
+                    del self._keys[idx]
+            bisect.insort(self._keys, (-stars, student_id))
+            self._stars[student_id] = stars
+
+    def remove(self, student_id: int) -> None:
+        with self._lock:
+            old_stars = self._stars.pop(student_id, None)
+            if old_stars is None:
+                return
+            idx = bisect.bisect_left(self._keys, (-old_stars, student_id))
+            if idx < len(self._keys) and self._keys[idx] == (-old_stars, student_id):
+                del self._keys[idx]
+
+    def top(self, limit: int = 10) -> List[Tuple[int, int, int]]:
+        """
+        Returns [(rank, student_id, stars), ...] for the best `limit` students.
+        """
+        with self._lock:
+            head = self._keys[:limit]
+            result = []
+            for idx, (neg_stars, student_id) in enumerate(head):
+                # Ties share the rank of the first student with that score
+                if idx > 0 and neg_stars == head[idx - 1][0]:
+                    rank = result[-1][0]
+                else:
+                    rank = idx + 1
+                result.append((rank, student_id, -neg_stars))
+            return result
+
+    def around(self, student_id: int, radius: int) -> List[Tuple[int, int, int]]:
+        """
+        Returns [(rank, student_id, stars), ...] for the `radius` students
+        above and below `student_id`, the student included.
+        """
+        with self._lock:
+            stars = self._stars.get(student_id)
+            if stars is None:
+                return []
+            position = bisect.bisect_left(self._keys, (-stars, student_id))
+            window = self._keys[max(position - radius, 0):position + radius + 1]
+            return [
+                (bisect.bisect_left(self._keys, (neg_stars,)) + 1, s_id, -neg_stars)
+                for neg_stars, s_id in window
+            ]
+
+    def rank_for_stars(self, stars: int) -> int:
+        """
+        Rank a student with `stars` would have (1 + number of students with more stars).
+        """
+        with self._lock:
+            return bisect.bisect_left(self._keys, (-(stars or 0),)) + 1
+
+    def rank(self, student_id: int) -> Optional[int]:
+        with self._lock:
+            stars = self._stars.get(student_id)
+            if stars is None:
+                return None
+            return self.rank_for_stars(stars)
+
+    def stars(self, student_id: int) -> Optional[int]:
+        with self._lock:
+            return self._stars.get(student_id)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, student_id: int) -> bool:
+        return student_id in self._stars
+
+    def check_consistency(self, db: Session, repair: bool = False) -> Dict[int, Tuple[Optional[int], Optional[int]]]:
+        """
+        Compare the in-memory ranking with the database.
+
+        Returns {student_id: (stars_in_memory, stars_in_db)} for every student
+        that differs. With `repair=True` the mismatching entries are fixed in place.
+        """
+        db_stars = {
+            student_id: total or 0
+            for student_id, total in self._scoped_query(db).all()
+        }
+
+        with self._lock:
+            mismatches = {}
+            for student_id, total in db_stars.items():
+                if self._stars.get(student_id) != total:
+                    mismatches[student_id] = (self._stars.get(student_id), total)
+            for student_id, total in self._stars.items():
+                if student_id not in db_stars:
+                    mismatches[student_id] = (total, None)
+
+            if repair:
+                for student_id, (_, total) in mismatches.items():
+                    if total is None:
+                        self.remove(student_id)
+                    else:
+                        self.update(student_id, total)
+
+        if mismatches:
+            logger.warning(f"Leaderboard {self.scope} drifted from DB for {len(mismatches)} students")
+        return mismatches
+
+
+class LeaderboardRegistry:
+    """
+    One RankedLeaderboard per scope, built lazily on first use.
+
+    Scoped rankings only ever load the students of their scope, so a course or
+    household leaderboard never filters the global list. The least recently
+    used scopes are evicted once `max_scopes` is reached.
+    """
+
+    def __init__(self, max_scopes: int = 512):
+        self.global_engine = RankedLeaderboard(GLOBAL_SCOPE)
+        self._scoped: "OrderedDict[ScopeKey, RankedLeaderboard]" = OrderedDict()
+        self._max_scopes = max_scopes
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, scope: ScopeKey = GLOBAL_SCOPE) -> RankedLeaderboard:
+        if scope == GLOBAL_SCOPE:
+            self.global_engine.ensure_loaded(db)
+            return self.global_engine
+
+        with self._lock:
+            engine = self._scoped.get(scope)
+            if engine is not None:
+                self._scoped.move_to_end(scope)
+        if engine is None:
+            engine = RankedLeaderboard(scope)
+            engine.load(db)
+            with self._lock:
+                self._scoped[scope] = engine
+                while len(self._scoped) > self._max_scopes:
+                    self._scoped.popitem(last=False)
+        return engine
+
+    def update(self, student_id: int, stars: int) -> List[ScopeKey]:
+        """
+        Propagate a new star total to the global ranking and every loaded scope holding the student.
+        Returns the scopes that were touched.
+        """
+        self.global_engine.update(student_id, stars)
+        with self._lock:
+            engines = list(self._scoped.values())
+        touched = [GLOBAL_SCOPE]
+        for engine in engines:
+            if student_id in engine:
+                engine.update(student_id, stars)
+                touched.append(engine.scope)
+        return touched
+
+    def invalidate(self, kind: Optional[str] = None) -> None:
+        """
+        Drop scoped rankings (all, or one kind) after membership changed, e.g. a course was activated.
+        """
+        with self._lock:
+            for scope in [key for key in self._scoped if kind is None or key[0] == kind]:
+                del self._scoped[scope]
+
+
+def window_scores(start_day: date, end_day: date, student_id: int, scope: ScopeKey = GLOBAL_SCOPE):
+    """
+    Stars earned per student between two UTC days (inclusive), read from the
+    daily rollup and limited to the students of `scope`. `student_id` is always
+    present, with 0 if they earned nothing, so the caller can be ranked in the
+    same statement.
+    """
+    earned = select(
+        DailyPointTotal.student_id.label("student_id"),
+        DailyPointTotal.amount.label("amount"),
+    ).where(
+        DailyPointTotal.currency_type == CurrencyType.STAR,
+        DailyPointTotal.day >= start_day,
+        DailyPointTotal.day <= end_day,
+    )
+    member_ids = scope_student_ids(scope)
+    if member_ids is not None:
+        earned = earned.where(DailyPointTotal.student_id.in_(member_ids))
+    caller = select(literal(student_id).label("student_id"), literal(0).label("amount"))
+    rows = union_all(earned, caller).subquery("window_rows")
+
+    return (
+        select(rows.c.student_id, func.sum(rows.c.amount).label("stars"))
+        .group_by(rows.c.student_id)
+        .subquery("scores")
+    )
+
+
+def ranked_window(db: Session, scores, student_id: int, limit: int = 10, radius: int = 0):
+    """
+    Rank `scores` (student_id, stars) in a single statement.
+
+    Returns rows of (rank, position, student_id, stars, full_name, avatar_url)
+    ordered by position: the top `limit` students, the `radius` neighbours
+    above and below `student_id`, and `student_id` itself.
+    """
+    ranked = select(
+        scores.c.student_id,
+        scores.c.stars,
+        func.rank().over(order_by=scores.c.stars.desc()).label("rank"),
+        func.row_number().over(order_by=(scores.c.stars.desc(), scores.c.student_id)).label("position"),
+    ).cte("ranked")
+
+    my_position = select(ranked.c.position).where(ranked.c.student_id == student_id).scalar_subquery()
+    conditions = [ranked.c.position <= limit, ranked.c.student_id == student_id]
+    if radius:
+        conditions.append(ranked.c.position.between(my_position - radius, my_position + radius))
+
+    stmt = (
+        select(
+            ranked.c.rank,
+            ranked.c.position,
+            ranked.c.student_id,
+            ranked.c.stars,
+            User.full_name,
+            StudentProfile.avatar_url,
+        )
+        .join(StudentProfile, StudentProfile.id == ranked.c.student_id)
+        .join(User, User.id == StudentProfile.user_id)
+        .where(or_(*conditions))
+        .order_by(ranked.c.position)
+    )
+    return db.execute(stmt).all()
+
+
+# Global instances; the all-time ranking is built at startup and every loaded
+# ranking is kept up to date when stars are awarded
+leaderboard_registry = LeaderboardRegistry()
+leaderboard_engine = leaderboard_registry.global_engine
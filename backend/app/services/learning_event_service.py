@@ -0,0 +1,202 @@
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import insert, text
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.enums import LearningEventType
+from app.models.learning_event import LearningEvent
+from app.services import activity_service
+
+logger = logging.getLogger(__name__)
+
+PARTITION_PREFIX = "learning_events_"
+# Longest gap between two events of a session that still counts as studying;
+# anything longer is treated as the app sitting idle.
+MAX_EVENT_GAP_SECONDS = 60
+
+
+def partition_name(day: date) -> str:
+    return f"{PARTITION_PREFIX}{day:%Y%m%d}"
+
+
+def ensure_partition(db: Session, day: date) -> None:
+    """
+    Create the partition holding `day` (UTC) if it doesn't exist yet.
+    """
+    db.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {partition_name(day)} PARTITION OF learning_events "
+        f"FOR VALUES FROM ('{day.isoformat()}') TO ('{(day + timedelta(days=1)).isoformat()}')"
+    ))
+
+
+def ensure_partitions(db: Session, start_day: date, days: int) -> None:
+    for offset in range(days):
+        ensure_partition(db, start_day + timedelta(days=offset))
+    db.commit()
+
+
+def list_partitions(db: Session) -> Dict[date, str]:
+    rows = db.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = 'learning_events'"
+    )).scalars().all()
+    partitions = {}
+    for name in rows:
+        try:
+            partitions[datetime.strptime(name[len(PARTITION_PREFIX):], "%Y%m%d").date()] = name
+        except ValueError:
+            continue
+    return partitions
+
+
+def drop_partitions_before(db: Session, cutoff_day: date) -> List[str]:
+    """
+    Drop every daily partition strictly older than `cutoff_day`. Returns the dropped names.
+    """
+    dropped = []
+    for day, name in sorted(list_partitions(db).items()):
+        if day < cutoff_day:
+            db.execute(text(f"DROP TABLE IF EXISTS {name}"))
+            dropped.append(name)
+    db.commit()
+    return dropped
+
+
+class LearningEventWriter:
+    """
+    Buffers learning events in memory and appends them in batches.
+
+    Events are written every `flush_interval` seconds by a background thread,
+    or as soon as `max_pending` are waiting, as one multi-row INSERT that also
+    adds their study time to the daily activity rollups. The daily partitions
+    they need are created on first use.
+    """
+
+    max_sessions = 50000
+
+    def __init__(self, flush_interval: float = 5.0, max_pending: int = 2000):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: List[dict] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._known_days: Set[date] = set()
+        self._last_seen: "OrderedDict[uuid.UUID, datetime]" = OrderedDict()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def record(
+        self,
+        student_id: int,
+        session_id: uuid.UUID,
+        event_type: LearningEventType,
+        lesson_id: Optional[int] = None,
+        position: Optional[int] = None,
+        occurred_at: Optional[datetime] = None,
+    ) -> None:
+        event = {
+            "student_id": student_id,
+            "session_id": session_id,
+            "event_type": event_type,
+            "lesson_id": lesson_id,
+            "position": position,
+            "occurred_at": occurred_at or datetime.utcnow(),
+        }
+        with self._lock:
+            self._pending.append(event)
+            is_full = len(self._pending) >= self.max_pending
+        self._ensure_thread()
+        if is_full:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Append every buffered event. Returns the number of events written.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+            try:
+                self._write(batch)
+                return len(batch)
+            except (OperationalError, InterfaceError) as e:
+                with self._lock:
+                    # Database unreachable: retry with the next flush, but never grow without bound
+                    room = max(self.max_pending * 2 - len(self._pending), 0)
+                    self._pending[:0] = batch[-room:] if room else []
+                dropped = len(batch) - min(room, len(batch))
+                logger.error(f"Failed to write {len(batch)} learning events, will retry ({dropped} dropped): {e}")
+                return 0
+            except Exception as e:
+                # Anything else (bad data) would fail again and block the events behind it
+                logger.error(f"Dropped {len(batch)} learning events that failed to write: {e}")
+                return 0
+
+    def stop(self) -> None:
+        self._stop.set()
+        self.flush()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="learning-event-flush", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def _add_study_time(self, db: Session, batch: List[dict]) -> Dict[uuid.UUID, datetime]:
+        """
+        Add the study time of `batch` to the daily activity rollups: each event
+        adds the time since the previous event of the same session, capped at
+        MAX_EVENT_GAP_SECONDS (longer gaps are the app sitting idle). The
+        previous event of a session is remembered per process; a session whose
+        earlier events were written by another worker just loses its first gap.
+        Returns the updated last-seen time per session.
+        """
+        last_seen: Dict[uuid.UUID, datetime] = {}
+        deltas = []
+        for event in sorted(batch, key=lambda e: e["occurred_at"]):
+            session_id, occurred_at = event["session_id"], event["occurred_at"]
+            previous = last_seen.get(session_id) or self._last_seen.get(session_id)
+            if previous is not None and occurred_at > previous:
+                gap = min((occurred_at - previous).total_seconds(), MAX_EVENT_GAP_SECONDS)
+                delta = activity_service.new_delta(event["student_id"], activity_service.local_day(occurred_at))
+                delta["study_seconds"] = int(gap)
+                deltas.append(delta)
+            if previous is None or occurred_at > previous:
+                last_seen[session_id] = occurred_at
+        activity_service.record_activity(db, deltas)
+        return last_seen
+
+    def _write(self, batch: List[dict]) -> None:
+        db = SessionLocal()
+        try:
+            new_days = {event["occurred_at"].date() for event in batch} - self._known_days
+            for day in sorted(new_days):
+                ensure_partition(db, day)
+            db.execute(insert(LearningEvent), batch)
+            last_seen = self._add_study_time(db, batch)
+            db.commit()
+            self._known_days.update(new_days)
+            self._last_seen.update(last_seen)
+            while len(self._last_seen) > self.max_sessions:
+                self._last_seen.popitem(last=False)
+        finally:
+            db.close()
+
+
+# Global instance, one buffer per worker process
+learning_event_writer = LearningEventWriter()
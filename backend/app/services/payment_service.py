@@ -6,6 +6,7 @@ from app.models.coupon import Coupon
 from app.models.enums import DiscountType
 from app.models.user import User
 from app.schemas.gem_pack import GemOrderResponse
+from app.services.student_state_service import bump_state_version
 import uuid
 import logging
 
@@ -130,6 +131,7 @@ class PaymentService:
         
         total_gems_to_add = gem_pack.get_total_gems()
         user.student_profile.total_gems += total_gems_to_add
+        bump_state_version(user.student_profile)
         db.add(user.student_profile)
         db.commit()
         
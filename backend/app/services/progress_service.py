@@ -0,0 +1,238 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import Row, func, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.curriculum import Lesson, VideoMaterial
+from app.models.enums import CurrencyType
+from app.models.progress import LessonProgress, LessonQuizSummary, QuizResult
+from app.models.user import StudentProfile
+from app.schemas.progress import ProgressUpdate, ProgressResponse
+from app.services import activity_service, completion_service, reward_service
+from app.services.student_state_service import bump_state_version
+
+PASS_THRESHOLD = 0.6
+LESSON_COMPLETION_GEMS = 10
+QUIZ_PASS_STARS = 3
+
+
+class UnknownLessonsError(ValueError):
+    def __init__(self, lesson_ids):
+        self.lesson_ids = sorted(lesson_ids)
+        super().__init__(f"Lessons not found: {self.lesson_ids}")
+
+
+def evaluate_submission(data: ProgressUpdate) -> tuple[bool, bool]:
+    """
+    Returns (passed_quiz, is_lesson_passed).
+    - If total_questions == 0 (Video only): Always passed/completed
+    - If total_questions > 0 (Quiz): Passed only if score >= threshold
+    """
+    if data.total_questions > 0:
+        passed = data.score / data.total_questions >= PASS_THRESHOLD
+        return passed, passed
+    return False, True
+
+
+def upsert_lesson_progress(
+    db: Session,
+    student_id: int,
+    lesson_ids: List[int],
+    completed_lesson_ids: Set[int],
+    now: datetime,
+) -> Dict[int, Row]:
+    """
+    Insert or touch one LessonProgress row per lesson in a single round trip.
+
+    A lesson never goes back to "not completed" and keeps its first
+    `completed_at`. Returns {lesson_id: (lesson_id, is_completed, completed_at, updated_at)}.
+    """
+    stmt = insert(LessonProgress).values([
+        {
+            "student_id": student_id,
+            "lesson_id": lesson_id,
+            "is_completed": lesson_id in completed_lesson_ids,
+            "completed_at": now if lesson_id in completed_lesson_ids else None,
+            "updated_at": now,
+        }
+        for lesson_id in lesson_ids
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[LessonProgress.student_id, LessonProgress.lesson_id],
+        set_={
+            "is_completed": or_(LessonProgress.is_completed == True, stmt.excluded.is_completed),
+            "completed_at": func.coalesce(LessonProgress.completed_at, stmt.excluded.completed_at),
+            "updated_at": stmt.excluded.updated_at,
+        }
+    ).returning(
+        LessonProgress.lesson_id,
+        LessonProgress.is_completed,
+        LessonProgress.completed_at,
+        LessonProgress.updated_at,
+    )
+    return {row.lesson_id: row for row in db.execute(stmt).all()}
+
+
+def upsert_quiz_summaries(
+    db: Session,
+    student_id: int,
+    quiz_attempts: Dict[int, List[Tuple[int, bool]]],
+    now: datetime,
+) -> Dict[int, Optional[datetime]]:
+    """
+    Fold the (score, passed) attempts of each lesson, in submission order, into
+    its LessonQuizSummary in a single round trip.
+    Returns {lesson_id: first_passed_at} for the lessons that were written.
+    """
+    if not quiz_attempts:
+        return {}
+
+    stmt = insert(LessonQuizSummary).values([
+        {
+            "student_id": student_id,
+            "lesson_id": lesson_id,
+            "attempts": len(attempts),
+            "best_score": max(score for score, _ in attempts),
+            "last_score": attempts[-1][0],
+            "first_passed_at": now if any(passed for _, passed in attempts) else None,
+            "updated_at": now,
+        }
+        for lesson_id, attempts in sorted(quiz_attempts.items())
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[LessonQuizSummary.student_id, LessonQuizSummary.lesson_id],
+        set_={
+            "attempts": LessonQuizSummary.attempts + stmt.excluded.attempts,
+            "best_score": func.greatest(LessonQuizSummary.best_score, stmt.excluded.best_score),
+            "last_score": stmt.excluded.last_score,
+            "first_passed_at": func.coalesce(LessonQuizSummary.first_passed_at, stmt.excluded.first_passed_at),
+            "updated_at": stmt.excluded.updated_at,
+        }
+    ).returning(LessonQuizSummary.lesson_id, LessonQuizSummary.first_passed_at)
+    return dict(db.execute(stmt).all())
+
+
+def apply_submissions(
+    db: Session,
+    student: StudentProfile,
+    submissions: List[ProgressUpdate],
+) -> Tuple[List[ProgressResponse], List[int]]:
+    """
+    Apply lesson completions / quiz results in order, inside the caller's transaction.
+
+    LessonProgress is written with a single INSERT ... ON CONFLICT DO UPDATE
+    (one row per lesson) whose RETURNING tells which lessons this call
+    completed for the first time: `completed_at` is only ever set once, so it
+    equals our timestamp exactly when we were the ones to set it. Concurrent
+    submissions for the same lesson serialize on the unique constraint, so
+    the 10 gems can't be awarded twice. The 3 stars for the first passed quiz
+    are decided the same way from LessonQuizSummary.first_passed_at. The
+    caller commits.
+
+    Returns the per-submission results and the ids of the lessons completed
+    for the first time, whose vocabulary still has to be added to SRS.
+    """
+    now = datetime.utcnow()
+    lesson_ids = {data.lesson_id for data in submissions}
+
+    # 1. Validate lessons (and read video durations for the activity rollup)
+    durations = dict(
+        db.query(Lesson.id, VideoMaterial.duration_seconds)
+        .outerjoin(VideoMaterial, VideoMaterial.lesson_id == Lesson.id)
+        .filter(Lesson.id.in_(lesson_ids))
+        .all()
+    )
+    missing = lesson_ids - durations.keys()
+    if missing:
+        raise UnknownLessonsError(missing)
+
+    # Index of the first submission that completes each lesson / passes its quiz
+    first_completion = {}
+    first_pass = {}
+    quiz_attempts: Dict[int, List[Tuple[int, bool]]] = {}
+    for idx, data in enumerate(submissions):
+        passed_quiz, is_lesson_passed = evaluate_submission(data)
+        if is_lesson_passed:
+            first_completion.setdefault(data.lesson_id, idx)
+        if data.total_questions > 0:
+            quiz_attempts.setdefault(data.lesson_id, []).append((data.score, passed_quiz))
+            if passed_quiz:
+                first_pass.setdefault(data.lesson_id, idx)
+
+    # 2. Upsert LessonProgress (Completion Logic - Gems), in lesson order to keep lock order stable
+    progress_rows = upsert_lesson_progress(db, student.id, sorted(lesson_ids), set(first_completion), now)
+    newly_completed_lessons = {
+        lesson_id for lesson_id, row in progress_rows.items() if row.completed_at == now
+    }
+
+    # 3. Upsert the quiz summaries (Quiz Logic - Stars)
+    newly_passed_lessons = {
+        lesson_id
+        for lesson_id, first_passed_at in upsert_quiz_summaries(db, student.id, quiz_attempts, now).items()
+        if first_passed_at == now
+    }
+
+    results = []
+    new_quiz_results = []
+
+    for idx, data in enumerate(submissions):
+        earned_gems = 0
+        earned_stars = 0
+        passed_quiz, _ = evaluate_submission(data)
+        progress = progress_rows[data.lesson_id]
+
+        if data.lesson_id in newly_completed_lessons:
+            is_completed = idx >= first_completion[data.lesson_id]
+            # Award Gems once, on the submission that completed the lesson
+            if idx == first_completion[data.lesson_id]:
+                earned_gems = LESSON_COMPLETION_GEMS
+                reward_service.award_points(db, student, earned_gems, CurrencyType.GEM, f"lesson_completed:{data.lesson_id}", now)
+        else:
+            is_completed = bool(progress.is_completed)
+
+        # Quiz history - Only if Quiz submitted
+        if data.total_questions > 0:
+            new_quiz_results.append(QuizResult(
+                student_id=student.id,
+                lesson_id=data.lesson_id,
+                score=data.score,
+                total_questions=data.total_questions,
+                passed=passed_quiz,
+                created_at=now
+            ))
+
+            # Award Stars only the first time the quiz is ever passed
+            if data.lesson_id in newly_passed_lessons and idx == first_pass[data.lesson_id]:
+                earned_stars = QUIZ_PASS_STARS
+                reward_service.award_points(db, student, earned_stars, CurrencyType.STAR, f"quiz_passed:{data.lesson_id}", now)
+
+        results.append(ProgressResponse(
+            message="Lesson updated",
+            is_completed=is_completed,
+            updated_at=progress.updated_at,
+            earned_gems=earned_gems,
+            earned_stars=earned_stars
+        ))
+
+    db.add_all(new_quiz_results)
+    completion_service.mark_lessons_completed(db, student.id, newly_completed_lessons)
+    # Completion / best scores on the learning path may have changed
+    bump_state_version(student)
+
+    # 4. Daily activity rollup
+    activity = activity_service.new_delta(student.id, activity_service.local_day(now))
+    activity["lessons_completed"] = len(newly_completed_lessons)
+    activity["completed_lesson_ids"] = sorted(newly_completed_lessons)
+    activity["estimated_seconds"] = sum(
+        durations[lesson_id] or activity_service.DEFAULT_LESSON_SECONDS for lesson_id in newly_completed_lessons
+    )
+    activity["quizzes_taken"] = len(new_quiz_results)
+    activity["low_score_lesson_ids"] = [
+        result.lesson_id for result in new_quiz_results if not result.passed
+    ]
+    activity_service.record_activity(db, [activity])
+
+    # 5. SRS Initialization for first completions is left to the caller (background job)
+    return results, sorted(newly_completed_lessons)
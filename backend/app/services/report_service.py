@@ -0,0 +1,141 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Integer, and_, case, cast, distinct, func, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from app.models.activity import DailyActivity
+from app.models.curriculum import Lesson
+from app.models.user import User, ParentProfile, StudentProfile
+from app.schemas.report import WeeklyReportResponse, DailyProgress
+
+
+def activity_reports(db: Session, student_ids: List[int], start_day: date, end_day: date) -> Dict[int, WeeklyReportResponse]:
+    """
+    Learning report of several students between two local days (inclusive).
+
+    Everything is aggregated by the database from the daily activity rollups,
+    in two statements whatever the number of students or days:
+    - minutes and lessons completed, grouped by (student_id, day)
+    - learned / weak words, grouped by student_id
+    Minutes come from logged sessions; a student without any logged session
+    in the range (older app versions) falls back to the completion estimate.
+    """
+    if not student_ids:
+        return {}
+
+    in_range = and_(
+        DailyActivity.student_id == func.any(student_ids),
+        DailyActivity.day >= start_day,
+        DailyActivity.day <= end_day,
+    )
+
+    # 1. Minutes / lessons completed per (student, day)
+    has_sessions = func.bool_or(func.sum(DailyActivity.study_seconds) > 0).over(
+        partition_by=DailyActivity.student_id
+    )
+    seconds = case(
+        (has_sessions, func.sum(DailyActivity.study_seconds)),
+        else_=func.sum(DailyActivity.estimated_seconds),
+    )
+    daily_rows = db.execute(
+        select(
+            DailyActivity.student_id,
+            DailyActivity.day,
+            cast(seconds / 60, Integer).label("minutes"),
+            func.sum(DailyActivity.lessons_completed).label("lessons_completed"),
+        )
+        .where(in_range)
+        .group_by(DailyActivity.student_id, DailyActivity.day)
+    ).all()
+
+    # 2. Learned words (completed lessons) and weak words (quizzes scored < 60%) per student
+    lesson_refs = union_all(
+        select(
+            DailyActivity.student_id,
+            func.unnest(DailyActivity.completed_lesson_ids).label("lesson_id"),
+            literal(True).label("is_learned"),
+        ).where(in_range),
+        select(
+            DailyActivity.student_id,
+            func.unnest(DailyActivity.low_score_lesson_ids).label("lesson_id"),
+            literal(False).label("is_learned"),
+        ).where(in_range),
+    ).subquery("lesson_refs")
+    word_rows = db.execute(
+        select(
+            lesson_refs.c.student_id,
+            func.array_agg(distinct(Lesson.pronunciation_word)).filter(lesson_refs.c.is_learned).label("learned_words"),
+            func.array_agg(distinct(Lesson.pronunciation_word)).filter(~lesson_refs.c.is_learned).label("weak_words"),
+        )
+        .join(Lesson, Lesson.id == lesson_refs.c.lesson_id)
+        .where(Lesson.pronunciation_word.isnot(None))
+        .group_by(lesson_refs.c.student_id)
+    ).all()
+
+    days = [start_day + timedelta(days=i) for i in range((end_day - start_day).days + 1)]
+    minutes = defaultdict(dict)
+    lessons_completed = defaultdict(int)
+    for student_id, day, day_minutes, completed in daily_rows:
+        minutes[student_id][day] = day_minutes or 0
+        lessons_completed[student_id] += completed or 0
+    words = {student_id: (learned or [], weak or []) for student_id, learned, weak in word_rows}
+
+    reports = {}
+    for student_id in student_ids:
+        daily_chart = [DailyProgress(date=d, minutes=minutes[student_id].get(d, 0)) for d in days]
+        learned_words, weak_words = words.get(student_id, ([], []))
+        reports[student_id] = WeeklyReportResponse(
+            total_minutes=sum(point.minutes for point in daily_chart),
+            lessons_completed=lessons_completed[student_id],
+            learned_words=learned_words,
+            weak_words=weak_words,
+            daily_chart=daily_chart
+        )
+    return reports
+
+
+def parent_reports_chunk(
+    db: Session, after_parent_id: int, limit: int, start_day: date, end_day: date
+) -> Tuple[List[dict], Optional[int]]:
+    """
+    Weekly reports of the children of the next `limit` parents (keyset on
+    ParentProfile.id > after_parent_id), ready to be sent by email.
+    Three grouped queries per chunk: parents, their children, then the reports.
+
+    Returns (recipients, last_parent_id); last_parent_id is None when there are no parents left.
+    """
+    parents = (
+        db.query(ParentProfile.id, User.email, User.full_name)
+        .join(User, ParentProfile.user_id == User.id)
+        .filter(ParentProfile.id > after_parent_id, User.is_active.is_(True))
+        .order_by(ParentProfile.id)
+        .limit(limit)
+        .all()
+    )
+    if not parents:
+        return [], None
+
+    children = (
+        db.query(StudentProfile.id, StudentProfile.parent_id, User.full_name)
+        .join(User, StudentProfile.user_id == User.id)
+        .filter(StudentProfile.parent_id == func.any([parent.id for parent in parents]))
+        .order_by(StudentProfile.id)
+        .all()
+    )
+    reports = activity_reports(db, [child.id for child in children], start_day, end_day)
+
+    children_by_parent = defaultdict(list)
+    for child in children:
+        children_by_parent[child.parent_id].append({
+            "full_name": child.full_name,
+            **reports[child.id].model_dump(mode="json"),
+        })
+
+    recipients = [
+        {"email_to": parent.email, "full_name": parent.full_name, "children": children_by_parent[parent.id]}
+        for parent in parents
+        if parent.email and children_by_parent[parent.id]
+    ]
+    return recipients, parents[-1].id
@@ -0,0 +1,62 @@
+from datetime import datetime
+
+from sqlalchemy import func, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.enums import CurrencyType
+from app.models.gamification import PointLog, DailyPointTotal
+from app.models.user import StudentProfile
+
+
+def award_points(
+    db: Session,
+    student: StudentProfile,
+    amount: int,
+    currency_type: CurrencyType,
+    reason: str,
+    awarded_at: datetime = None,
+) -> None:
+    """
+    Credit gems/stars to a student inside the caller's transaction.
+
+    Updates the running total on the profile, appends a PointLog row and
+    bumps the (student, day, currency) rollup used by windowed leaderboards.
+    The total is incremented in SQL, like the rollup, so concurrent awards
+    never lose an update; the profile attributes are reloaded on next access.
+    The caller is responsible for committing.
+    """
+    if not amount:
+        return
+
+    awarded_at = awarded_at or datetime.utcnow()
+
+    total = StudentProfile.total_stars if currency_type == CurrencyType.STAR else StudentProfile.total_gems
+    db.execute(
+        update(StudentProfile)
+        .where(StudentProfile.id == student.id)
+        .values({total: func.coalesce(total, 0) + amount, StudentProfile.state_version: StudentProfile.state_version + 1})
+    )
+    db.expire(student, [total.key, "state_version"])
+
+    db.add(PointLog(
+        student_id=student.id,
+        change_amount=amount,
+        currency_type=currency_type,
+        reason=reason,
+        created_at=awarded_at
+    ))
+
+    # Leaderboards only count earnings, so spending never lowers the rollup
+    if amount > 0:
+        stmt = insert(DailyPointTotal).values(
+            student_id=student.id,
+            day=awarded_at.date(),
+            currency_type=currency_type,
+            amount=amount
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DailyPointTotal.student_id, DailyPointTotal.day, DailyPointTotal.currency_type],
+            set_={"amount": DailyPointTotal.amount + stmt.excluded.amount}
+        )
+        db.execute(stmt)
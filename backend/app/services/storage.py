@@ -1,4 +1,7 @@
 from minio import Minio
+from minio.error import S3Error
+from typing import Optional, Tuple
+import io
 from app.core.config import settings
 import uuid
 import os
@@ -78,5 +81,58 @@ class MinioHandler:
             print(f"Error uploading file to MinIO: {e}")
             raise e
 
+    def public_url(self, object_name: str) -> str:
+        return f"http://{settings.MINIO_PUBLIC_ENDPOINT}/{self.bucket_name}/{object_name}"
+
+    def object_name_from_url(self, url: Optional[str]) -> Optional[str]:
+        """
+        Object name of a URL returned by `upload_file`, None for external URLs.
+        """
+        prefix = self.public_url("")
+        if url and url.startswith(prefix):
+            return url[len(prefix):]
+        return None
+
+    def put_bytes(self, object_name: str, data: bytes, content_type: str, metadata: Optional[dict] = None) -> None:
+        """
+        Store `data` under a fixed object name (overwrites an existing object).
+        """
+        self.client.put_object(
+            bucket_name=self.bucket_name,
+            object_name=object_name,
+            data=io.BytesIO(data),
+            length=len(data),
+            content_type=content_type,
+            metadata=metadata
+        )
+
+    def get_bytes(self, object_name: str) -> Optional[bytes]:
+        """
+        Content of an object, None if it doesn't exist.
+        """
+        try:
+            response = self.client.get_object(self.bucket_name, object_name)
+        except S3Error as e:
+            if e.code == "NoSuchKey":
+                return None
+            raise
+        try:
+            return response.read()
+        finally:
+            response.close()
+            response.release_conn()
+
+    def stat(self, object_name: str) -> Optional[Tuple[int, str]]:
+        """
+        (size, etag) of an object, None if it doesn't exist.
+        """
+        try:
+            stat = self.client.stat_object(self.bucket_name, object_name)
+        except S3Error as e:
+            if e.code in ("NoSuchKey", "NoSuchObject"):
+                return None
+            raise
+        return stat.size, stat.etag
+
 # Create a global instance
 minio_handler = MinioHandler()
@@ -0,0 +1,25 @@
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.models.user import StudentProfile
+
+
+def bump_state_version(student: StudentProfile) -> None:
+    """
+    Mark the student's state as changed, inside the caller's transaction.
+
+    Flushed as `state_version = state_version + 1`, so concurrent writers never
+    lose a bump; the attribute is reloaded from the database on next access.
+    """
+    student.state_version = StudentProfile.state_version + 1
+
+
+def bump_user_state_version(db: Session, user_id: int) -> None:
+    """
+    Same as `bump_state_version`, by user id (no-op for users without a student profile).
+    """
+    db.execute(
+        update(StudentProfile)
+        .where(StudentProfile.user_id == user_id)
+        .values(state_version=StudentProfile.state_version + 1)
+    )
@@ -1,5 +1,9 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload
 from datetime import datetime, timedelta
+from app.models.curriculum import Lesson
 from app.models.srs import UserWordProgress
 from app.models.vocabulary import Vocabulary
 from app.schemas.study import WordSubmit
@@ -51,7 +55,15 @@ def get_or_create_progress(db: Session, user_id: int, word_id: int) -> UserWordP
             next_review_at=datetime.utcnow()
         )
         db.add(progress)
-        db.commit()
+        try:
+            db.commit()
+        except IntegrityError:
+            # Created concurrently (e.g. by the lesson vocabulary job)
+            db.rollback()
+            return db.query(UserWordProgress).filter(
+                UserWordProgress.user_id == user_id,
+                UserWordProgress.word_id == word_id
+            ).one()
         db.refresh(progress)
         
     return progress
@@ -74,39 +86,49 @@ def submit_word_progress(db: Session, user_id: int, submit_data: WordSubmit) ->
     db.refresh(progress)
     return progress
 
-def get_words_due_for_review(db: Session, user_id: int, limit: int = 20):
+def words_due_for_review_query(db: Session, user_id: int):
+    """
+    Word progress due now (with its word), for keyset pagination on (next_review_at, id).
+    """
     now = datetime.utcnow()
-    return db.query(UserWordProgress).filter(
+    return db.query(UserWordProgress).options(joinedload(UserWordProgress.vocabulary)).filter(
         UserWordProgress.user_id == user_id,
         UserWordProgress.next_review_at <= now
-    ).limit(limit).all()
+    )
 
-def initialize_lesson_vocabulary(db: Session, user_id: int, vocab_list: list[str]):
+def initialize_lesson_vocabulary(db: Session, user_id: int, vocab_list: list[str], commit: bool = True) -> int:
     """
     Initialize SRS progress for a list of words strings (from a lesson).
-    Finds the Vocabulary IDs and creates progress entries if missing.
+    Finds the Vocabulary IDs and creates progress entries if missing, in a
+    single INSERT ... SELECT that skips words the user already has, so it is
+    safe to run more than once. Returns the number of entries created.
     """
     if not vocab_list:
-        return
-        
-    # 1. Find Vocabulary IDs for these words
-    vocab_entities = db.query(Vocabulary).filter(Vocabulary.word.in_(vocab_list)).all()
-    
-    for vocab in vocab_entities:
-        # Check if progress already exists
-        exists = db.query(UserWordProgress).filter(
-            UserWordProgress.user_id == user_id,
-            UserWordProgress.word_id == vocab.id
-        ).first()
-        
-        if not exists:
-            # Create new progress entry (Level 1, Review Today/Now)
-            new_progress = UserWordProgress(
-                user_id=user_id,
-                word_id=vocab.id,
-                box_level=1,
-                next_review_at=datetime.utcnow() 
-            )
-            db.add(new_progress)
-    
-    db.commit()
+        return 0
+
+    # New progress entries start at Level 1, Review Today/Now
+    new_progress = select(
+        literal(user_id),
+        Vocabulary.id,
+        literal(1),
+        literal(datetime.utcnow()),
+    ).where(Vocabulary.word.in_(set(vocab_list)))
+    stmt = insert(UserWordProgress).from_select(
+        ["user_id", "word_id", "box_level", "next_review_at"], new_progress
+    ).on_conflict_do_nothing(
+        index_elements=[UserWordProgress.user_id, UserWordProgress.word_id]
+    )
+    created = db.execute(stmt).rowcount
+
+    if commit:
+        db.commit()
+    return created
+
+def initialize_lessons_vocabulary(db: Session, user_id: int, lesson_ids: list[int], commit: bool = True) -> int:
+    """
+    Initialize SRS progress for the vocabulary of several lessons at once.
+    """
+    words = []
+    for (vocabulary,) in db.query(Lesson.vocabulary).filter(Lesson.id.in_(lesson_ids)).all():
+        words.extend(vocabulary or [])
+    return initialize_lesson_vocabulary(db, user_id, words, commit=commit)
@@ -1,7 +1,18 @@
 import asyncio
+from celery import group
 from app.core.celery_app import celery_app
+from app.core.database import SessionLocal
 from app.services.email_service import email_service
-from typing import Dict, Any
+from app.models.job_checkpoint import JobCheckpoint
+from app.services import study_service, learning_event_service, activity_service, report_service
+from app.core.config import settings
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, List, Optional
+
+# Parents per chunk of the weekly report job (one checkpoint commit per chunk)
+WEEKLY_REPORT_CHUNK_SIZE = 200
+# Day the weekly report is scheduled on (date.weekday(): Sunday, see celery beat)
+WEEKLY_REPORT_WEEKDAY = 6
 
 # Wrapper to run async functions in sync Celery task
 def run_async(coroutine):
@@ -26,3 +37,95 @@ def send_welcome_email_task(email_to: str, full_name: str):
 @celery_app.task(autoretry_for=(Exception,), retry_backoff=True, retry_kwargs={'max_retries': 3})
 def send_payment_success_email_task(email_to: str, full_name: str, order_info: Dict[str, Any]):
     return asyncio.run(email_service.send_payment_success_email(email_to, full_name, order_info))
+
+@celery_app.task(autoretry_for=(Exception,), retry_backoff=True, retry_kwargs={'max_retries': 3})
+def send_weekly_report_email_task(email_to: str, full_name: str, week_start: str, week_end: str, children: List[Dict[str, Any]]):
+    return asyncio.run(email_service.send_weekly_report_email(email_to, full_name, week_start, week_end, children))
+
+@celery_app.task(autoretry_for=(Exception,), retry_backoff=True, retry_kwargs={'max_retries': 5})
+def initialize_lesson_vocabulary_task(user_id: int, lesson_ids: List[int]):
+    """
+    Seed SRS progress for the vocabulary of lessons a user just completed.
+    Idempotent (existing words are skipped), so retries and duplicates are harmless.
+    """
+    db = SessionLocal()
+    try:
+        return study_service.initialize_lessons_vocabulary(db, user_id, lesson_ids)
+    finally:
+        db.close()
+
+@celery_app.task
+def maintain_learning_event_partitions_task():
+    """
+    Daily: create the learning event partitions for the coming week and drop
+    the ones past the retention period. Scheduled by celery beat; the
+    writer's lazy `ensure_partition` is only a fallback.
+    """
+    db = SessionLocal()
+    try:
+        today = datetime.utcnow().date()
+        learning_event_service.ensure_partitions(db, today - timedelta(days=1), days=9)
+        return learning_event_service.drop_partitions_before(
+            db, today - timedelta(days=settings.LEARNING_EVENT_RETENTION_DAYS)
+        )
+    finally:
+        db.close()
+
+def last_weekly_report_day(today: date) -> date:
+    """
+    Scheduled day of the most recent weekly report run (today on the day itself).
+    """
+    return today - timedelta(days=(today.weekday() - WEEKLY_REPORT_WEEKDAY) % 7)
+
+@celery_app.task(
+    acks_late=True, reject_on_worker_lost=True,
+    autoretry_for=(Exception,), retry_backoff=True, retry_kwargs={'max_retries': 5}
+)
+def send_weekly_reports_task(week_end: Optional[str] = None):
+    """
+    Weekly: email every parent the report of their children for the 7 local
+    days ending on `week_end` (ISO date, defaults to the last scheduled day).
+
+    Parents are walked in keyset-paginated chunks; each chunk's reports are
+    computed with grouped queries and its emails are enqueued as one group.
+    The checkpoint is keyed on the week and committed after every chunk, and
+    the message is only acknowledged once the run ends: a crashed or retried
+    run, even one redelivered after midnight, picks up where it stopped (at
+    most the chunk in flight is sent twice).
+    """
+    db = SessionLocal()
+    try:
+        end_day = date.fromisoformat(week_end) if week_end else last_weekly_report_day(activity_service.local_today())
+        week_start = end_day - timedelta(days=6)
+        name = f"weekly_report:{week_start.isoformat()}"
+
+        checkpoint = db.get(JobCheckpoint, name)
+        if checkpoint is None:
+            checkpoint = JobCheckpoint(name=name, last_id=0, processed=0)
+            db.add(checkpoint)
+            db.commit()
+        if checkpoint.finished_at:
+            return checkpoint.processed
+
+        while True:
+            recipients, last_id = report_service.parent_reports_chunk(
+                db, checkpoint.last_id, WEEKLY_REPORT_CHUNK_SIZE, week_start, end_day
+            )
+            if last_id is None:
+                break
+            if recipients:
+                group(
+                    send_weekly_report_email_task.s(
+                        week_start=week_start.strftime("%d/%m/%Y"), week_end=end_day.strftime("%d/%m/%Y"), **recipient
+                    )
+                    for recipient in recipients
+                ).apply_async()
+            checkpoint.last_id = last_id
+            checkpoint.processed += len(recipients)
+            db.commit()
+
+        checkpoint.finished_at = datetime.utcnow()
+        db.commit()
+        return checkpoint.processed
+    finally:
+        db.close()
@@ -0,0 +1,140 @@
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import InterfaceError, OperationalError
+
+from app.core.database import SessionLocal
+from app.models.curriculum import Lesson
+from app.models.progress import LessonProgress
+from app.models.user import StudentProfile
+
+logger = logging.getLogger(__name__)
+
+# (student_id, lesson_id)
+WatchKey = Tuple[int, int]
+
+
+class WatchPositionBuffer:
+    """
+    Coalesces video player heartbeats before they reach the database.
+
+    Only the latest position per (student, lesson) is kept in memory. A
+    background thread writes everything pending every `flush_interval`
+    seconds in one multi-row upsert; a pause, or `max_pending` buffered keys,
+    wakes it up early. Requests never write themselves. Positions are per
+    process, so a reader that needs the freshest value should go through
+    `get_position`.
+    """
+
+    def __init__(self, flush_interval: float = 15.0, max_pending: int = 5000):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: Dict[WatchKey, Tuple[int, datetime]] = {}
+        self._lock = threading.Lock()
+        # Serializes flushes so two writers never race on the same rows
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def record(self, student_id: int, lesson_id: int, position: int, flush: bool = False) -> None:
+        with self._lock:
+            self._pending[(student_id, lesson_id)] = (position, datetime.utcnow())
+            is_full = len(self._pending) >= self.max_pending
+        self._ensure_thread()
+        if flush or is_full:
+            self._wake.set()
+
+    def get_position(self, student_id: int, lesson_id: int) -> Optional[int]:
+        """
+        Buffered position not yet written to the database, if any.
+        """
+        with self._lock:
+            pending = self._pending.get((student_id, lesson_id))
+        return pending[0] if pending else None
+
+    def flush(self) -> int:
+        """
+        Write every buffered position. Returns the number of rows written.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            try:
+                return self._write(batch)
+            except (OperationalError, InterfaceError) as e:
+                logger.error(f"Failed to flush {len(batch)} watch positions, will retry: {e}")
+                # Database unreachable: put the batch back unless a newer heartbeat arrived meanwhile
+                with self._lock:
+                    for key, value in batch.items():
+                        self._pending.setdefault(key, value)
+                return 0
+            except Exception as e:
+                # Anything else (bad data) would fail again on every retry
+                logger.error(f"Dropped {len(batch)} watch positions that failed to flush: {e}")
+                return 0
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        self.flush()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="watch-position-flush", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            self.flush()
+
+    @staticmethod
+    def _write(batch: Dict[WatchKey, Tuple[int, datetime]]) -> int:
+        db = SessionLocal()
+        try:
+            # Drop heartbeats for lessons/students that don't exist instead of failing the whole batch
+            lesson_ids = {lesson_id for _, lesson_id in batch}
+            student_ids = {student_id for student_id, _ in batch}
+            known_lessons = {l_id for (l_id,) in db.query(Lesson.id).filter(Lesson.id.in_(lesson_ids)).all()}
+            known_students = {s_id for (s_id,) in db.query(StudentProfile.id).filter(StudentProfile.id.in_(student_ids)).all()}
+            rows = [
+                {
+                    "student_id": student_id,
+                    "lesson_id": lesson_id,
+                    "is_completed": False,
+                    "last_watched_position": position,
+                    "updated_at": seen_at,
+                }
+                for (student_id, lesson_id), (position, seen_at) in sorted(batch.items())
+                if lesson_id in known_lessons and student_id in known_students
+            ]
+            if not rows:
+                return 0
+
+            stmt = insert(LessonProgress).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[LessonProgress.student_id, LessonProgress.lesson_id],
+                set_={
+                    "last_watched_position": stmt.excluded.last_watched_position,
+                    "updated_at": stmt.excluded.updated_at,
+                }
+            )
+            db.execute(stmt)
+            db.commit()
+            return len(rows)
+        finally:
+            db.close()
+
+
+# Global instance, one buffer per worker process
+watch_position_buffer = WatchPositionBuffer()
@@ -0,0 +1,168 @@
+"""
+Benchmark of the weekly report: legacy ORM/Python path vs the SQL report engine.
+
+Creates a throw-away student with thousands of lesson progress rows and quiz
+results in the last 7 days (plus the matching daily activity rollups), times
+both implementations on it and rolls everything back. Minutes differ on
+purpose: the legacy path estimates them, the engine uses logged session time.
+
+Usage: python benchmark_report.py [lessons] [runs]
+"""
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from app.core.database import SessionLocal
+from app.models.curriculum import Course, Unit, Lesson, VideoMaterial
+from app.models.enums import CourseLevel, LessonType, UserRole
+from app.models.progress import LessonProgress, QuizResult
+from app.models.user import User, StudentProfile
+from app.services import activity_service, report_service
+
+
+def legacy_weekly_report(db, student_id):
+    """
+    GET /reports/weekly as it was before the rollups: full ORM rows, aggregated in Python.
+    """
+    today = datetime.utcnow().date()
+    start_date = today - timedelta(days=6)
+    start_datetime = datetime.combine(start_date, datetime.min.time())
+
+    progress_records = (
+        db.query(LessonProgress, Lesson, VideoMaterial)
+        .join(Lesson, LessonProgress.lesson_id == Lesson.id)
+        .outerjoin(VideoMaterial, Lesson.id == VideoMaterial.lesson_id)
+        .filter(
+            LessonProgress.student_id == student_id,
+            LessonProgress.updated_at >= start_datetime
+        )
+        .all()
+    )
+
+    daily_map = {start_date + timedelta(days=i): 0 for i in range(7)}
+    learned_words = set()
+    total_minutes = 0
+    lessons_completed = 0
+    for prog, lesson, video in progress_records:
+        day = prog.updated_at.date()
+        if prog.is_completed:
+            lessons_completed += 1
+            if lesson.pronunciation_word:
+                learned_words.add(lesson.pronunciation_word)
+            duration = video.duration_seconds if video and video.duration_seconds else 300
+        else:
+            duration = prog.last_watched_position or 0
+        minutes = duration // 60
+        if day in daily_map:
+            daily_map[day] += minutes
+        total_minutes += minutes
+
+    db.query(Lesson.pronunciation_word).join(QuizResult, QuizResult.lesson_id == Lesson.id).filter(
+        QuizResult.student_id == student_id,
+        QuizResult.created_at >= start_datetime,
+        Lesson.pronunciation_word.isnot(None)
+    ).all()
+    quiz_results = (
+        db.query(QuizResult, Lesson)
+        .join(Lesson, QuizResult.lesson_id == Lesson.id)
+        .filter(QuizResult.student_id == student_id, QuizResult.created_at >= start_datetime)
+        .all()
+    )
+    weak_words = set()
+    for qr, lesson in quiz_results:
+        if qr.total_questions > 0 and qr.score / qr.total_questions < 0.6 and lesson.pronunciation_word:
+            weak_words.add(lesson.pronunciation_word)
+
+    return total_minutes, lessons_completed, len(learned_words), len(weak_words)
+
+
+def new_weekly_report(db, student_id):
+    today = activity_service.local_today()
+    report = report_service.activity_reports(db, [student_id], today - timedelta(days=6), today)[student_id]
+    return report.total_minutes, report.lessons_completed, len(report.learned_words), len(report.weak_words)
+
+
+def create_fixture(db, lesson_count):
+    now = datetime.utcnow()
+    user = User(email=f"bench-{now.timestamp()}@example.com", hashed_password="x", full_name="Benchmark", role=UserRole.STUDENT)
+    db.add(user)
+    db.flush()
+    student = StudentProfile(user_id=user.id)
+    course = Course(title="Benchmark", level=CourseLevel.STARTERS)
+    db.add_all([student, course])
+    db.flush()
+    unit = Unit(course_id=course.id, title="Benchmark", order_index=0)
+    db.add(unit)
+    db.flush()
+
+    rng = random.Random(42)
+    lesson_ids = db.execute(insert(Lesson).returning(Lesson.id), [
+        {"unit_id": unit.id, "title": f"Lesson {i}", "lesson_type": LessonType.VOCABULARY,
+         "order_index": i, "pronunciation_word": f"word{i % 500}"}
+        for i in range(lesson_count)
+    ]).scalars().all()
+    db.execute(insert(VideoMaterial), [
+        {"lesson_id": lesson_id, "video_url": "http://example.com/v.mp4", "duration_seconds": rng.choice([0, 180, 420])}
+        for lesson_id in lesson_ids
+    ])
+
+    progress, quizzes, deltas = [], [], []
+    for lesson_id in lesson_ids:
+        at = now - timedelta(seconds=rng.randint(0, 6 * 86400))
+        completed = rng.random() < 0.6
+        progress.append({"student_id": student.id, "lesson_id": lesson_id, "is_completed": completed,
+                         "completed_at": at if completed else None,
+                         "last_watched_position": rng.randint(0, 600), "updated_at": at})
+        delta = activity_service.new_delta(student.id, activity_service.local_day(at))
+        delta["study_seconds"] = rng.randint(60, 600)
+        if completed:
+            delta["lessons_completed"] = 1
+            delta["completed_lesson_ids"] = [lesson_id]
+            delta["estimated_seconds"] = 300
+        for _ in range(2):
+            score = rng.randint(0, 10)
+            quizzes.append({"student_id": student.id, "lesson_id": lesson_id, "score": score,
+                            "total_questions": 10, "passed": score >= 6, "created_at": at})
+            delta["quizzes_taken"] += 1
+            if score < 6:
+                delta["low_score_lesson_ids"].append(lesson_id)
+        deltas.append(delta)
+    db.execute(insert(LessonProgress), progress)
+    db.execute(insert(QuizResult), quizzes)
+    activity_service.record_activity(db, deltas)
+    db.flush()
+    return student.id
+
+
+def bench(label, fn, db, student_id, runs):
+    timings = []
+    for _ in range(runs):
+        db.expire_all()
+        started = time.perf_counter()
+        result = fn(db, student_id)
+        timings.append((time.perf_counter() - started) * 1000)
+    print(f"{label:<8} median {statistics.median(timings):8.2f} ms   min {min(timings):8.2f} ms   result {result}")
+
+
+def main():
+    lesson_count = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    db = SessionLocal()
+    try:
+        student_id = create_fixture(db, lesson_count)
+        print(f"Student {student_id}: {lesson_count} progress rows, {lesson_count * 2} quiz results, {runs} runs each")
+        bench("legacy", legacy_weekly_report, db, student_id, runs)
+        bench("engine", new_weekly_report, db, student_id, runs)
+    finally:
+        # Nothing is ever committed
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+build_snapshot must load the curriculum in a constant number of statements,
+whatever the number of courses, units, lessons and questions.
+
+Runs against the configured database; fixtures are written inside a
+transaction that is rolled back afterwards.
+"""
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.core.database import engine
+from app.models.curriculum import Course, Unit, Lesson, Question
+from app.models.enums import CourseLevel, LessonType
+from app.services.curriculum_service import build_snapshot
+
+# courses, units, lessons, questions: one selectinload statement per level
+EXPECTED_STATEMENTS = 4
+
+
+@pytest.fixture
+def db():
+    try:
+        connection = engine.connect()
+    except OperationalError as e:
+        pytest.skip(f"database not available: {e}")
+    transaction = connection.begin()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
+def add_courses(db: Session, count: int, units: int = 3, lessons: int = 4, questions: int = 5) -> None:
+    for c in range(count):
+        course = Course(title=f"Course {c}", level=CourseLevel.STARTERS)
+        for u in range(units):
+            unit = Unit(title=f"Unit {u}", order_index=u)
+            for l in range(lessons):
+                lesson = Lesson(title=f"Lesson {l}", lesson_type=LessonType.VOCABULARY, order_index=l)
+                lesson.questions = [
+                    Question(text=f"Question {q}", options=["a", "b"], correct_answer="a", order_index=q)
+                    for q in range(questions)
+                ]
+                unit.lessons.append(lesson)
+            course.units.append(unit)
+        db.add(course)
+    db.flush()
+    # Load from the database, not from the objects just added
+    db.expire_all()
+
+
+def count_snapshot_statements(db: Session) -> int:
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        snapshot = build_snapshot(db, version=1)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    assert snapshot.courses
+    return len(statements)
+
+
+def test_snapshot_statement_count_is_constant(db):
+    add_courses(db, 1)
+    one_course = count_snapshot_statements(db)
+
+    add_courses(db, 20)
+    many_courses = count_snapshot_statements(db)
+
+    assert one_course == EXPECTED_STATEMENTS
+    assert many_courses == one_course
+
+
+def test_snapshot_keeps_path_order(db):
+    add_courses(db, 2, units=3, lessons=3, questions=2)
+    snapshot = build_snapshot(db, version=1)
+    for course in snapshot.courses:
+        assert [unit.order_index for unit in course.units] == sorted(unit.order_index for unit in course.units)
+        for unit in course.units:
+            assert [lesson.order_index for lesson in unit.lessons] == sorted(l.order_index for l in unit.lessons)
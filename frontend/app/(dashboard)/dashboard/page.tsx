@@ -9,7 +9,11 @@ import { LessonCard } from "@/components/LessonCard";
 export default function DashboardPage() {
     const { isAuthenticated } = useAuth(true); // Protect route
     const [units, setUnits] = useState<UnitDashboard[]>([]);
+    const [courseId, setCourseId] = useState<number | null>(null);
+    const [prevCursor, setPrevCursor] = useState<number | null>(null);
+    const [nextCursor, setNextCursor] = useState<number | null>(null);
     const [loading, setLoading] = useState(true);
+    const [loadingMore, setLoadingMore] = useState(false);
 
     useEffect(() => {
         if (!isAuthenticated) return;
@@ -18,6 +22,9 @@ export default function DashboardPage() {
             try {
                 const res = await axiosClient.get<DashboardPathResponse>("/dashboard/path");
                 setUnits(res.data.units);
+                setCourseId(res.data.course_id);
+                setPrevCursor(res.data.prev_cursor);
+                setNextCursor(res.data.next_cursor);
             } catch (error) {
                 console.error("Failed to fetch path", error);
             } finally {
@@ -28,6 +35,29 @@ export default function DashboardPage() {
         fetchPath();
     }, [isAuthenticated]);
 
+    // Load the units before / after the ones already shown
+    const loadMore = async (direction: "before" | "after") => {
+        const cursor = direction === "before" ? prevCursor : nextCursor;
+        if (cursor === null || courseId === null) return;
+        setLoadingMore(true);
+        try {
+            const res = await axiosClient.get<DashboardPathResponse>("/dashboard/path", {
+                params: { course_id: courseId, [direction]: cursor },
+            });
+            if (direction === "before") {
+                setUnits((current) => [...res.data.units, ...current]);
+                setPrevCursor(res.data.prev_cursor);
+            } else {
+                setUnits((current) => [...current, ...res.data.units]);
+                setNextCursor(res.data.next_cursor);
+            }
+        } catch (error) {
+            console.error("Failed to fetch path", error);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     if (loading) {
         return (
             <div className="flex justify-center items-center h-[50vh]">
@@ -48,6 +78,18 @@ export default function DashboardPage() {
                 </p>
             </div>
 
+            {prevCursor !== null && (
+                <div className="mb-8 text-center">
+                    <button
+                        onClick={() => loadMore("before")}
+                        disabled={loadingMore}
+                        className="px-6 py-2 rounded-full bg-sky-100 text-sky-700 font-bold hover:bg-sky-200 disabled:opacity-50"
+                    >
+                        Xem các bài trước
+                    </button>
+                </div>
+            )}
+
             <div className="space-y-12">
                 {units.map((unit) => (
                     <div key={unit.id} className="relative">
@@ -73,6 +115,18 @@ export default function DashboardPage() {
                     </div>
                 ))}
             </div>
+
+            {nextCursor !== null && (
+                <div className="mt-12 text-center">
+                    <button
+                        onClick={() => loadMore("after")}
+                        disabled={loadingMore}
+                        className="px-6 py-2 rounded-full bg-orange-100 text-orange-700 font-bold hover:bg-orange-200 disabled:opacity-50"
+                    >
+                        Xem các bài tiếp theo
+                    </button>
+                </div>
+            )}
         </div>
     );
 }
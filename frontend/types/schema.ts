@@ -84,7 +84,11 @@ export interface UnitDashboard {
 }
 
 export interface DashboardPathResponse {
+    course_id: number | null;
+    current_unit_id: number | null;
     units: UnitDashboard[];
+    prev_cursor: number | null;
+    next_cursor: number | null;
 }
 
 export interface ShopItem {